@@ -0,0 +1,134 @@
+# algoritmo_genetico.py
+import time
+import numpy as np
+
+
+# ============================================================
+# Algoritmo genético vectorizado (línea base para FunSearch)
+# La población es una matriz booleana (individuos × ítems):
+#   - aptitud y peso: productos matriz–vector X @ v, X @ w
+#   - reparación: a las filas con sobrepeso se les quitan los
+#     ítems de menor densidad (prefijo mínimo cuyo peso cubre el
+#     exceso, con cumsum sobre las columnas ordenadas) y luego se
+#     rellenan con un greedy por densidad vectorizado sobre filas
+#   - selección por torneo, cruce uniforme y mutación bit a bit
+#     con máscaras aleatorias; elitismo de los mejores
+# Solo depende de NumPy: evaluate_candidate puede cargar este
+# archivo como código candidato y compararlo directamente.
+# ============================================================
+
+def _reparar(X, w, capacity, orden_asc):
+    """Quita de cada fila con sobrepeso los ítems de menor densidad necesarios."""
+    exceso = X @ w - capacity
+    filas = np.flatnonzero(exceso > 0)
+    if len(filas):
+        sub = X[np.ix_(filas, orden_asc)]
+        pesos = sub * w[orden_asc]
+        previo = np.cumsum(pesos, axis=1) - pesos
+        quitar = sub & (previo < exceso[filas, None])
+        sub &= ~quitar
+        X[np.ix_(filas, orden_asc)] = sub
+    return X
+
+
+def _rellenar(X, w, capacity, orden_desc):
+    """Greedy por densidad aplicado a todas las filas a la vez."""
+    usado = X @ w
+    for j in orden_desc:
+        cabe = ~X[:, j] & (usado + w[j] <= capacity)
+        X[cabe, j] = True
+        usado[cabe] += w[j]
+    return X
+
+
+def algoritmo_genetico(weights, values, capacity, poblacion=64, generaciones=500, prob_cruce=0.9,
+                       prob_mutacion=None, elite=2, torneo=3, max_sin_mejora=100,
+                       tiempo_limite=None, deadline=None, semilla=None, reportar=None):
+    """
+    Resuelve la mochila 0/1 con un algoritmo genético vectorizado. Termina al
+    completar 'generaciones', tras max_sin_mejora generaciones sin mejorar o
+    al pasar el tiempo límite / deadline. Si se entrega reportar (protocolo
+    anytime de KnapsackSkeleton) se le envía cada nuevo mejor individuo.
+    Devuelve un diccionario con el formato de KnapsackSkeleton.solve() más
+    "generaciones".
+    """
+    start_time = time.time()
+    if tiempo_limite is not None:
+        limite = start_time + tiempo_limite
+        deadline = limite if deadline is None else min(deadline, limite)
+    rng = np.random.default_rng(semilla)
+    w = np.asarray(weights, dtype=float)
+    v = np.asarray(values, dtype=float)
+    n = len(w)
+    if n == 0:
+        return {"items": [], "total_value": 0, "total_peso_usado": 0,
+                "solve_time": time.time() - start_time, "generaciones": 0}
+    if prob_mutacion is None:
+        prob_mutacion = 1.0 / n
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        densidad = np.where(w > 0, v / np.where(w > 0, w, 1), np.where(v > 0, np.inf, 0.0))
+    orden_desc = np.argsort(-densidad, kind="stable")
+    orden_asc = orden_desc[::-1]
+
+    # Población inicial: el greedy más individuos aleatorios reparados
+    prob_inicial = min(1.0, capacity / w.sum()) if w.sum() > 0 else 1.0
+    X = rng.random((poblacion, n)) < prob_inicial
+    X[0] = False
+    X = _rellenar(_reparar(X, w, capacity, orden_asc), w, capacity, orden_desc)
+
+    mejor_x, mejor_valor = None, -np.inf
+    sin_mejora = 0
+    generacion = 0
+    while generacion < generaciones and sin_mejora < max_sin_mejora:
+        if deadline is not None and time.time() >= deadline:
+            break
+        generacion += 1
+        aptitud = X @ v
+
+        k = int(np.argmax(aptitud))
+        if aptitud[k] > mejor_valor:
+            mejor_valor, mejor_x = aptitud[k], X[k].copy()
+            sin_mejora = 0
+            if reportar is not None:
+                reportar({"items": [int(i) for i in np.flatnonzero(mejor_x)]})
+        else:
+            sin_mejora += 1
+
+        # Selección por torneo (de a 'torneo' competidores por padre)
+        rivales = rng.integers(0, poblacion, size=(2 * poblacion, torneo))
+        padres = rivales[np.arange(2 * poblacion), np.argmax(aptitud[rivales], axis=1)]
+        madres, padres = X[padres[:poblacion]], X[padres[poblacion:]]
+
+        # Cruce uniforme y mutación
+        mascara = rng.random((poblacion, n)) < 0.5
+        cruzar = rng.random(poblacion) < prob_cruce
+        hijos = np.where(mascara & cruzar[:, None], padres, madres)
+        hijos ^= rng.random((poblacion, n)) < prob_mutacion
+
+        # Elitismo: los mejores individuos pasan sin cambios
+        if elite:
+            hijos[:elite] = X[np.argsort(-aptitud, kind="stable")[:elite]]
+        X = _rellenar(_reparar(hijos, w, capacity, orden_asc), w, capacity, orden_desc)
+
+    aptitud = X @ v
+    k = int(np.argmax(aptitud))
+    if mejor_x is None or aptitud[k] > mejor_valor:
+        mejor_x = X[k]
+
+    items = [int(i) for i in np.flatnonzero(mejor_x)]
+    return {
+        "items": items,
+        "total_value": sum(values[i] for i in items),
+        "total_peso_usado": sum(weights[i] for i in items),
+        "solve_time": time.time() - start_time,
+        "generaciones": generacion
+    }
+
+
+def heuristic(items_state):
+    """Adaptador con la firma de KnapsackSkeleton.heuristic."""
+    return algoritmo_genetico(items_state["weights"], items_state["values"], items_state["capacity"],
+                              tiempo_limite=items_state.get("tiempo_limite"),
+                              deadline=items_state.get("deadline"),
+                              reportar=items_state.get("reportar"))
@@ -2,7 +2,11 @@
 import os
 import pickle
 import matplotlib.pyplot as plt
-from Ejercicio_KP.Solver_OR_tools import SolverMochila
+try:
+    from Ejercicio_KP.Solver_OR_tools import SolverMochila
+except ImportError:
+    # Sin el paquete de OR-Tools se usa el solver exacto nativo (misma interfaz)
+    from solver_mochila import SolverMochila
 import numpy as np
 
 
@@ -14,7 +18,7 @@ class EvaluadorMochila:
         self.get_hash_id = hash_id_func if hash_id_func else lambda: "default"
 
     def resolver_muestras(self):
-        """Resuelve cada muestra con OR-Tools y agrega las métricas al DataFrame."""
+        """Resuelve cada muestra con OR-Tools (o el solver nativo) y agrega las métricas al DataFrame."""
         tiempos = []
         valores_totales = []
         pesos_totales = []
@@ -4,6 +4,30 @@ def heuristic(items_state):
     capacity = items_state["capacity"]
     num_items = len(weights)
 
+    # Optional mode: Phase 2 (1-for-k) refills with prefix sums + binary search
+    # instead of a full greedy scan per selected item. Same swaps, less work.
+    use_prefix_refill = bool(items_state.get("prefix_refill", False))
+
+    # Large-n mode: every neighborhood only looks at a candidate list of the
+    # items whose density is closest to the critical (first rejected) item,
+    # the number of passes is capped and an optional time budget is honored.
+    # Enabled automatically from LARGE_N_THRESHOLD items unless "large_n" is given.
+    LARGE_N_THRESHOLD = 1500
+    large_n = items_state.get("large_n")
+    if large_n is None:
+        large_n = num_items >= LARGE_N_THRESHOLD
+    candidate_k = int(items_state.get("candidate_k", 48))
+    max_passes = items_state.get("max_passes", 4 * candidate_k if large_n else None)
+    time_budget = items_state.get("time_budget")
+    deadline = items_state.get("deadline")
+    if time_budget is not None or deadline is not None:
+        import time
+        if time_budget is not None:
+            budget_deadline = time.time() + time_budget
+            deadline = budget_deadline if deadline is None else min(deadline, budget_deadline)
+    # Anytime protocol: the skeleton may pass a callback to harvest the incumbent
+    report = items_state.get("reportar")
+
     # Handle edge cases: no items or zero capacity
     if num_items == 0 or capacity == 0:
         return {
@@ -36,31 +60,86 @@ def heuristic(items_state):
     # This tie-breaking helps in selecting better items when densities are similar.
     item_data.sort(key=lambda x: (x[0], x[1]), reverse=True)
 
-    current_total_value = 0
-    current_total_weight = 0
-    current_selected_items_indices = set()
-    
-    # Use a dictionary for unselected items for efficient O(1) add/remove by index.
-    # Maps original_index -> (density, value, weight, original_index)
-    unselected_items_dict = {} 
-
     # --- Initial Greedy Selection Pass ---
     # Iterate through sorted items and add them if they fit within capacity.
-    for density, value, weight, original_index in item_data:
-        if current_total_weight + weight <= capacity:
-            current_selected_items_indices.add(original_index)
-            current_total_weight += weight
-            current_total_value += value
+    # The pass can complete a partial selection (used by the warm start below).
+    # Unselected items go to a dictionary for efficient O(1) add/remove by index:
+    # original_index -> (density, value, weight, original_index)
+    def greedy_fill(base_indices, base_weight):
+        selected = set(base_indices)
+        total_weight = base_weight
+        total_value = sum(values[idx] for idx in selected)
+        unselected = {}
+        first_rejected_density = None
+        for density, value, weight, original_index in item_data:
+            if original_index in selected:
+                continue # Kept from the base selection
+            if total_weight + weight <= capacity:
+                selected.add(original_index)
+                total_weight += weight
+                total_value += value
+            else:
+                unselected[original_index] = (density, value, weight, original_index)
+                if first_rejected_density is None:
+                    first_rejected_density = density
+        return selected, total_weight, total_value, unselected, first_rejected_density
+
+    (current_selected_items_indices, current_total_weight, current_total_value,
+     unselected_items_dict, critical_density) = greedy_fill((), 0)
+
+    # --- Warm start (optional) ---
+    # items_state["solucion_inicial"] carries a previous solution. Repair it by
+    # dropping the lowest-density items until it fits, complete it greedily and
+    # resume the local search from there (unless plain greedy is already better).
+    # The previous solution was already a local optimum, so the neighborhoods
+    # are restricted to the items touched since then ("items_modificados",
+    # repaired, refilled or moved) plus the candidate list around the critical item.
+    warm_start = items_state.get("solucion_inicial")
+    if warm_start is not None:
+        warm_original = set(idx for idx in warm_start if 0 <= idx < num_items)
+        warm_touched = set(items_state.get("items_modificados", ()))
+        warm_set = set(warm_original)
+        warm_weight = sum(weights[idx] for idx in warm_set)
+        for density, value, weight, original_index in reversed(item_data):
+            if warm_weight <= capacity:
+                break
+            if original_index in warm_set:
+                warm_set.discard(original_index)
+                warm_weight -= weight
+        warm_solution = greedy_fill(warm_set, warm_weight)
+        if warm_solution[2] >= current_total_value:
+            (current_selected_items_indices, current_total_weight, current_total_value,
+             unselected_items_dict, _) = warm_solution
         else:
-            unselected_items_dict[original_index] = (density, value, weight, original_index)
+            warm_start = None # Cold start: plain greedy is better than the repaired solution
+    if critical_density is None:
+        critical_density = 0.0
+
+    # Report the greedy solution right away: if the search is interrupted or
+    # fails, the caller still keeps a feasible incumbent.
+    if report is not None:
+        report({
+            "items": list(current_selected_items_indices),
+            "total_value": current_total_value,
+            "total_peso_usado": current_total_weight,
+            "solve_time": 0.0
+        })
             
     # --- Local Search: Iterative 1-for-1, 1-for-k, and 2-for-1 Swaps ---
     # This phase attempts to improve the solution by exploring different swap neighborhoods.
     # It continues iterating until a full pass yields no improvements across all phases.
     
     improvement_made = True
+    passes_done = 0
     while improvement_made:
         improvement_made = False # Reset for each iteration of the outer while loop
+
+        # Stop criteria for bounded runs: pass cap and time budget
+        if max_passes is not None and passes_done >= max_passes:
+            break
+        if deadline is not None and time.time() >= deadline:
+            break
+        passes_done += 1
         
         # --- PHASE 0: Add all available 0-weight items with positive value ---
         # This is done first because it's always an improvement and doesn't consume capacity.
@@ -100,6 +179,25 @@ def heuristic(items_state):
         temp_unselected_items_list_by_density = list(unselected_items_dict.values())
         temp_unselected_items_list_by_density.sort(key=lambda x: (x[0], x[1]), reverse=True) 
 
+        if large_n or warm_start is not None:
+            # Candidate lists: top-k selected and top-k unselected by density gap to the
+            # critical item. The lists keep their sort order, so every phase below runs
+            # unchanged on O(k) items instead of O(n).
+            selected_candidates = set(
+                sorted(current_selected_items_indices, key=lambda idx: abs(item_properties[idx][0] - critical_density))[:candidate_k]
+            )
+            unselected_candidates = set(
+                sorted(unselected_items_dict, key=lambda idx: abs(item_properties[idx][0] - critical_density))[:candidate_k]
+            )
+            if warm_start is not None:
+                # Warm start: every item touched since the previous solution stays a candidate
+                touched = warm_touched | (current_selected_items_indices ^ warm_original)
+                selected_candidates |= touched & current_selected_items_indices
+                unselected_candidates |= touched & unselected_items_dict.keys()
+            temp_selected_item_info = [entry for entry in temp_selected_item_info if entry[2] in selected_candidates]
+            temp_unselected_items_list_by_value = [entry for entry in temp_unselected_items_list_by_value if entry[3] in unselected_candidates]
+            temp_unselected_items_list_by_density = [entry for entry in temp_unselected_items_list_by_density if entry[3] in unselected_candidates]
+
 
         # --- Phase 1: Best 1-for-1 swaps ---
         best_1for1_value_gain = 0
@@ -152,8 +250,65 @@ def heuristic(items_state):
         best_1fork_add_weight = 0
         best_1fork_add_value = 0
 
+        if use_prefix_refill:
+            # Prefix sums over the density-ordered unselected items (once per pass).
+            # Zero-weight items never add value here (Phase 0 already took the valuable ones).
+            refill_items = [entry for entry in temp_unselected_items_list_by_density if entry[2] > 0]
+            num_refill = len(refill_items)
+            prefix_weight = [0] * (num_refill + 1)
+            prefix_value = [0] * (num_refill + 1)
+            for k in range(num_refill):
+                prefix_weight[k + 1] = prefix_weight[k] + refill_items[k][2]
+                prefix_value[k + 1] = prefix_value[k] + refill_items[k][1]
+            # suffix_min_weight[k] = lightest item among refill_items[k:], used to stop the tail early
+            suffix_min_weight = [float('inf')] * (num_refill + 1)
+            for k in range(num_refill - 1, -1, -1):
+                suffix_min_weight[k] = min(suffix_min_weight[k + 1], refill_items[k][2])
+
+            for sel_value, sel_weight, sel_idx in temp_selected_item_info:
+                available_capacity = capacity - (current_total_weight - sel_weight)
+
+                # Binary search: longest density-ordered prefix that fits entirely
+                low, high = 0, num_refill
+                while low < high:
+                    mid = (low + high + 1) // 2
+                    if prefix_weight[mid] <= available_capacity:
+                        low = mid
+                    else:
+                        high = mid - 1
+                prefix_len = low
+
+                # Pruning: the LP relaxation bounds any greedy refill from above
+                upper_bound = prefix_value[prefix_len]
+                if prefix_len < num_refill:
+                    upper_bound += (available_capacity - prefix_weight[prefix_len]) * refill_items[prefix_len][0]
+                if upper_bound - sel_value <= best_1fork_value_gain:
+                    continue
+
+                # Tail repair: same greedy as the full scan, starting after the prefix
+                potential_add_weight = prefix_weight[prefix_len]
+                potential_add_value = prefix_value[prefix_len]
+                tail_indices = []
+                k = prefix_len + 1
+                while k < num_refill and available_capacity - potential_add_weight >= suffix_min_weight[k]:
+                    unsel_density, unsel_value, unsel_weight, unsel_idx_to_add = refill_items[k]
+                    if potential_add_weight + unsel_weight <= available_capacity:
+                        tail_indices.append(unsel_idx_to_add)
+                        potential_add_weight += unsel_weight
+                        potential_add_value += unsel_value
+                    k += 1
+
+                current_1fork_value_gain = potential_add_value - sel_value
+                if (prefix_len or tail_indices) and current_1fork_value_gain > best_1fork_value_gain:
+                    best_1fork_value_gain = current_1fork_value_gain
+                    best_1fork_sel_idx = sel_idx
+                    best_1fork_add_indices = set(entry[3] for entry in refill_items[:prefix_len])
+                    best_1fork_add_indices.update(tail_indices)
+                    best_1fork_add_weight = potential_add_weight
+                    best_1fork_add_value = potential_add_value
+
         # Iterate through selected items, trying to replace each with multiple unselected items
-        for sel_value, sel_weight, sel_idx in temp_selected_item_info:
+        for sel_value, sel_weight, sel_idx in ([] if use_prefix_refill else temp_selected_item_info):
             # Temporarily remove sel_idx to calculate available capacity and value
             temp_current_total_weight = current_total_weight - sel_weight
             temp_current_total_value = current_total_value - sel_value
@@ -0,0 +1,481 @@
+# busqueda_local.py
+import time
+from bisect import bisect_left, bisect_right, insort
+
+from indice_pesos import IndicePorPeso
+
+
+# ============================================================
+# Motor de búsqueda local incremental para la mochila 0/1
+# Reproduce las fases de best_candidate_code.py (0: peso 0,
+# 1: intercambio 1-por-1, 2: 1-por-k, 3: 2-por-1) pero mantiene
+# los conjuntos de seleccionados y no seleccionados en listas
+# ordenadas incrementales (por valor y por densidad) y evalúa
+# cada movimiento por su delta de peso y valor. Aplicar un
+# movimiento cuesta O(log n) búsquedas binarias por ítem movido,
+# en lugar de reconstruir y reordenar todas las listas.
+# Si los pesos son enteros pequeños, un IndicePorPeso responde
+# "mejor no seleccionado que cabe en h" en O(log W) y reemplaza
+# los dobles bucles de las fases 1-por-1 y 2-por-1.
+# ============================================================
+
+# Mayor peso entero para el que se usa automáticamente el índice por peso
+PESO_MAXIMO_INDICE = 4096
+
+# Con foco (arranque en caliente, mochila dinámica) los vecindarios se acotan:
+# cada ítem del foco se combina solo con esta cantidad de seleccionados de
+# menor valor (1-por-1, 2-por-1) y el relleno 1-por-k revisa a lo más esta
+# cantidad de ítems después del prefijo que cabe completo
+SOCIOS_FOCO = 64
+
+def densidad(peso, valor):
+    """Densidad valor/peso con el criterio de las heurísticas (peso 0 => inf o 0)."""
+    if peso == 0:
+        return float("inf") if valor > 0 else 0.0
+    return valor / peso
+
+
+class _ListaOrdenada:
+    """Lista de claves ordenadas con inserción y borrado por búsqueda binaria."""
+
+    def __init__(self, claves=()):
+        self._claves = sorted(claves)
+
+    def agregar(self, clave):
+        insort(self._claves, clave)
+
+    def quitar(self, clave):
+        pos = bisect_left(self._claves, clave)
+        if pos == len(self._claves) or self._claves[pos] != clave:
+            raise KeyError(clave)
+        del self._claves[pos]
+
+    def __iter__(self):
+        return iter(self._claves)
+
+    def __len__(self):
+        return len(self._claves)
+
+    def __getitem__(self, pos):
+        return self._claves[pos]
+
+
+class MotorBusquedaLocal:
+    """
+    Estado incremental de una solución y vecindarios de intercambio.
+
+    Claves de orden (el índice i desempata; el peso va al final solo para
+    tenerlo a mano al recorrer las listas):
+        - seleccionados:        (valor, peso, i)            ascendente
+        - no sel. por valor:    (-valor, -densidad, i, w)   valor descendente
+        - no sel. por densidad: (-densidad, -valor, i, w)   densidad descendente
+    """
+
+    def __init__(self, weights, values, capacity, seleccion_inicial=None, indice_pesos=None):
+        self.weights = list(weights)
+        self.values = list(values)
+        self.capacity = capacity
+        self.densidades = [densidad(w, v) for w, v in zip(self.weights, self.values)]
+
+        if seleccion_inicial is None:
+            seleccion = self._greedy()
+        else:
+            seleccion = self._reparar(set(seleccion_inicial))
+
+        self.seleccion = set(seleccion)
+        self.total_weight = sum(self.weights[i] for i in self.seleccion)
+        self.total_value = sum(self.values[i] for i in self.seleccion)
+
+        no_sel = [i for i in range(len(self.weights)) if i not in self.seleccion]
+        self.sel = _ListaOrdenada(self._clave_sel(i) for i in self.seleccion)
+        self.no_sel_valor = _ListaOrdenada(self._clave_valor(i) for i in no_sel)
+        self.no_sel_densidad = _ListaOrdenada(self._clave_densidad(i) for i in no_sel)
+        self.movimientos = 0
+        # Foco del arranque en caliente: si no es None, las fases solo consideran
+        # movimientos con al menos un ítem del foco (los ítems movidos se agregan)
+        self.foco = None
+        self.inactivos = set()
+
+        # Índice por peso de los no seleccionados (None = automático)
+        if indice_pesos is None:
+            indice_pesos = bool(self.weights) and all(
+                float(w).is_integer() and 0 <= w <= PESO_MAXIMO_INDICE for w in self.weights)
+        self.indice = None
+        if indice_pesos:
+            self.indice = IndicePorPeso(max(self.weights, default=0))
+            for i in no_sel:
+                self.indice.agregar(i, self.weights[i], self.values[i])
+
+    # ------------------------------------------------------------
+    # Construcción y reparación
+    # ------------------------------------------------------------
+    def _greedy(self):
+        orden = sorted(range(len(self.weights)), key=lambda i: (self.densidades[i], self.values[i]), reverse=True)
+        seleccion, usado = [], 0
+        for i in orden:
+            if usado + self.weights[i] <= self.capacity:
+                seleccion.append(i)
+                usado += self.weights[i]
+        return seleccion
+
+    def _reparar(self, seleccion):
+        """Quita los ítems de menor densidad hasta que la solución sea factible."""
+        usado = sum(self.weights[i] for i in seleccion)
+        for i in sorted(seleccion, key=lambda i: (self.densidades[i], self.values[i])):
+            if usado <= self.capacity:
+                break
+            seleccion.discard(i)
+            usado -= self.weights[i]
+        return seleccion
+
+    # ------------------------------------------------------------
+    # Claves y actualización incremental
+    # ------------------------------------------------------------
+    def _clave_sel(self, i):
+        return (self.values[i], self.weights[i], i)
+
+    def _clave_valor(self, i):
+        return (-self.values[i], -self.densidades[i], i, self.weights[i])
+
+    def _clave_densidad(self, i):
+        return (-self.densidades[i], -self.values[i], i, self.weights[i])
+
+    def _entrar(self, i):
+        self.no_sel_valor.quitar(self._clave_valor(i))
+        self.no_sel_densidad.quitar(self._clave_densidad(i))
+        self.sel.agregar(self._clave_sel(i))
+        if self.indice is not None:
+            self.indice.quitar(i)
+        self.seleccion.add(i)
+        self.total_weight += self.weights[i]
+        self.total_value += self.values[i]
+
+    def _salir(self, i):
+        self.sel.quitar(self._clave_sel(i))
+        self.no_sel_valor.agregar(self._clave_valor(i))
+        self.no_sel_densidad.agregar(self._clave_densidad(i))
+        if self.indice is not None:
+            self.indice.agregar(i, self.weights[i], self.values[i])
+        self.seleccion.discard(i)
+        self.total_weight -= self.weights[i]
+        self.total_value -= self.values[i]
+
+    # ------------------------------------------------------------
+    # Cambios de la instancia (usados por mochila_dinamica.py)
+    # Los índices son estables: un ítem quitado queda inactivo y
+    # simplemente deja de estar en las listas.
+    # ------------------------------------------------------------
+    def _insertar_no_sel(self, i):
+        self.no_sel_valor.agregar(self._clave_valor(i))
+        self.no_sel_densidad.agregar(self._clave_densidad(i))
+        if self.indice is not None:
+            peso = self.weights[i]
+            if float(peso).is_integer() and 0 <= peso <= PESO_MAXIMO_INDICE:
+                self.indice.agregar(i, peso, self.values[i])
+            else:
+                self.indice = None  # el índice solo admite pesos enteros pequeños
+
+    def _retirar_no_sel(self, i):
+        self.no_sel_valor.quitar(self._clave_valor(i))
+        self.no_sel_densidad.quitar(self._clave_densidad(i))
+        if self.indice is not None:
+            self.indice.quitar(i)
+
+    def agregar_item(self, peso, valor):
+        """Agrega un ítem (no seleccionado) y devuelve su índice."""
+        i = len(self.weights)
+        self.weights.append(peso)
+        self.values.append(valor)
+        self.densidades.append(densidad(peso, valor))
+        self._insertar_no_sel(i)
+        return i
+
+    def quitar_item(self, i):
+        """Saca el ítem i de la instancia (queda inactivo)."""
+        if i in self.seleccion:
+            self._salir(i)
+        self._retirar_no_sel(i)
+        self.inactivos.add(i)
+
+    def actualizar_item(self, i, peso, valor):
+        """Cambia peso y valor del ítem i conservando si está seleccionado (puede quedar infactible)."""
+        seleccionado = i in self.seleccion
+        if seleccionado:
+            self._salir(i)
+        self._retirar_no_sel(i)
+        self.weights[i], self.values[i] = peso, valor
+        self.densidades[i] = densidad(peso, valor)
+        self._insertar_no_sel(i)
+        if seleccionado:
+            self._entrar(i)
+
+    def reparar(self):
+        """Quita los seleccionados de menor densidad hasta que la solución sea factible."""
+        if self.holgura >= 0:
+            return self
+        quitar, exceso = [], -self.holgura
+        for i in sorted(self.seleccion, key=lambda i: (self.densidades[i], self.values[i])):
+            if exceso <= 0:
+                break
+            quitar.append(i)
+            exceso -= self.weights[i]
+        self.mover(quitar, ())
+        return self
+
+    def rellenar(self):
+        """Agrega por densidad descendente los no seleccionados que caben (greedy)."""
+        agregar, holgura = [], self.holgura
+        for _, _, u, w_u in self.no_sel_densidad:
+            if w_u <= holgura:
+                agregar.append(u)
+                holgura -= w_u
+        if agregar:
+            self.mover((), agregar)
+        return self
+
+    def mover(self, quitar=(), agregar=()):
+        """Aplica un movimiento: saca los ítems 'quitar' y mete los de 'agregar'."""
+        for i in quitar:
+            self._salir(i)
+        for i in agregar:
+            self._entrar(i)
+        if self.foco is not None:
+            self.foco.update(quitar)
+            self.foco.update(agregar)
+        self.movimientos += 1
+
+    @property
+    def holgura(self):
+        return self.capacity - self.total_weight
+
+    # ------------------------------------------------------------
+    # Vecindarios: cada uno devuelve (ganancia, quitar, agregar) o None
+    # ------------------------------------------------------------
+    def fase_cero(self):
+        agregar = [c[2] for c in self.no_sel_valor if c[3] == 0 and c[0] < 0]
+        if not agregar:
+            return None
+        return sum(self.values[i] for i in agregar), (), tuple(agregar)
+
+    def _mejor_entrante(self, disponible, quitado_v, mejor_ganancia):
+        """(valor, i) del no seleccionado de mayor valor con peso <= disponible, si mejora la ganancia."""
+        if self.indice is not None:
+            candidato = self.indice.mejor_hasta(disponible)
+            if candidato is not None and candidato[0] - quitado_v > mejor_ganancia:
+                return candidato
+            return None
+        for menos_v_u, _, u, w_u in self.no_sel_valor:
+            if -menos_v_u - quitado_v <= mejor_ganancia:
+                break
+            if w_u <= disponible:
+                # Primer no seleccionado factible = el de mayor valor
+                return -menos_v_u, u
+        return None
+
+    def _seleccionados_foco(self):
+        """Claves (valor, peso, i) de los seleccionados que están en el foco."""
+        return sorted(self._clave_sel(i) for i in self.foco if i in self.seleccion)
+
+    def mejor_1x1(self):
+        if not len(self.sel) or not len(self.no_sel_valor):
+            return None
+        if self.foco is not None:
+            return self._mejor_1x1_foco()
+        if self.indice is not None:
+            return self._mejor_1x1_indice()
+        holgura = self.holgura
+        valor_min_sel = self.sel[0][0]
+        mejor = None
+        mejor_ganancia = 0
+        for menos_v_u, _, u, w_u in self.no_sel_valor:
+            v_u = -menos_v_u
+            if v_u - valor_min_sel <= mejor_ganancia:
+                break  # los siguientes tienen menor valor: no pueden superar la mejor ganancia
+            if w_u > self.capacity:
+                continue
+            for v_s, w_s, s in self.sel:
+                if v_u - v_s <= mejor_ganancia:
+                    break
+                if w_u - w_s <= holgura:
+                    # Primer seleccionado factible = el de menor valor: mejor socio para u
+                    mejor_ganancia = v_u - v_s
+                    mejor = (mejor_ganancia, (s,), (u,))
+                    break
+        return mejor
+
+    def _mejor_1x1_indice(self):
+        holgura = self.holgura
+        valor_max = -self.no_sel_valor[0][0]
+        mejor = None
+        mejor_ganancia = 0
+        for v_s, w_s, s in self.sel:
+            if valor_max - v_s <= mejor_ganancia:
+                break  # seleccionados por valor ascendente: la ganancia solo baja
+            candidato = self.indice.mejor_hasta(holgura + w_s)
+            if candidato is not None and candidato[0] - v_s > mejor_ganancia:
+                mejor_ganancia = candidato[0] - v_s
+                mejor = (mejor_ganancia, (s,), (candidato[1],))
+        return mejor
+
+    def _mejor_1x1_foco(self):
+        """1-por-1 restringido a intercambios con al menos un ítem del foco."""
+        holgura = self.holgura
+        mejor = None
+        mejor_ganancia = 0
+        for v_s, w_s, s in self._seleccionados_foco():
+            candidato = self._mejor_entrante(holgura + w_s, v_s, mejor_ganancia)
+            if candidato is not None:
+                mejor_ganancia = candidato[0] - v_s
+                mejor = (mejor_ganancia, (s,), (candidato[1],))
+        for u in self.foco:
+            if u in self.seleccion or u in self.inactivos:
+                continue
+            v_u, w_u = self.values[u], self.weights[u]
+            for v_s, w_s, s in self.sel[:SOCIOS_FOCO]:
+                if v_u - v_s <= mejor_ganancia:
+                    break
+                if w_u - w_s <= holgura:
+                    mejor_ganancia = v_u - v_s
+                    mejor = (mejor_ganancia, (s,), (u,))
+                    break
+        return mejor
+
+    def mejor_1xk(self):
+        holgura = self.holgura
+        mejor = None
+        mejor_ganancia = 0
+        seleccionados = self.sel if self.foco is None else self._seleccionados_foco()
+        if not len(seleccionados):
+            return None
+
+        # Sumas prefijas por densidad: la relajación lineal acota el relleno greedy.
+        # Solo hacen falta hasta superar el mayor espacio disponible posible.
+        maximo_disponible = holgura + max(w_s for _, w_s, _ in seleccionados)
+        peso_pref, valor_pref = [0], [0]
+        for menos_d, menos_v, _, w_u in self.no_sel_densidad:
+            peso_pref.append(peso_pref[-1] + w_u)
+            valor_pref.append(valor_pref[-1] - menos_v)
+            if peso_pref[-1] > maximo_disponible:
+                break
+        claves = self.no_sel_densidad
+
+        for v_s, w_s, s in seleccionados:
+            disponible = holgura + w_s
+            r = bisect_right(peso_pref, disponible) - 1
+            cota = valor_pref[r]
+            if r < len(claves):
+                cota += (disponible - peso_pref[r]) * -claves[r][0]
+            if cota - v_s <= mejor_ganancia:
+                continue
+
+            # Relleno greedy: el prefijo de r ítems cabe completo; luego se
+            # revisa la cola (acotada a SOCIOS_FOCO ítems si hay foco)
+            agregar = [claves[j][2] for j in range(r)]
+            peso, valor = peso_pref[r], valor_pref[r]
+            fin = len(claves) if self.foco is None else min(len(claves), r + SOCIOS_FOCO)
+            for j in range(r, fin):
+                if peso == disponible:
+                    break
+                menos_d, menos_v, u, w_u = claves[j]
+                if peso + w_u <= disponible:
+                    agregar.append(u)
+                    peso += w_u
+                    valor -= menos_v
+            ganancia = valor - v_s
+            if agregar and ganancia > mejor_ganancia:
+                mejor_ganancia = ganancia
+                mejor = (ganancia, (s,), tuple(agregar))
+        return mejor
+
+    def mejor_2x1(self):
+        holgura = self.holgura
+        sel = list(self.sel)
+        mejor = None
+        mejor_ganancia = 0
+        if not len(self.no_sel_valor):
+            return None
+        valor_max = -self.no_sel_valor[0][0]
+
+        if self.foco is not None:
+            # Cada seleccionado del foco se combina con los SOCIOS_FOCO de menor valor
+            for v1, w1, s1 in self._seleccionados_foco():
+                for v2, w2, s2 in sel[:SOCIOS_FOCO + 1]:
+                    if s2 == s1:
+                        continue
+                    if valor_max - (v1 + v2) <= mejor_ganancia:
+                        break
+                    candidato = self._mejor_entrante(holgura + w1 + w2, v1 + v2, mejor_ganancia)
+                    if candidato is not None:
+                        mejor_ganancia = candidato[0] - v1 - v2
+                        mejor = (mejor_ganancia, (s1, s2), (candidato[1],))
+            return mejor
+
+        for a in range(len(sel) - 1):
+            v1, w1, s1 = sel[a]
+            if valor_max - (v1 + sel[a + 1][0]) <= mejor_ganancia:
+                break  # ningún par desde aquí puede mejorar
+            for b in range(a + 1, len(sel)):
+                v2, w2, s2 = sel[b]
+                quitado_v, quitado_w = v1 + v2, w1 + w2
+                if valor_max - quitado_v <= mejor_ganancia:
+                    break  # seleccionados ordenados por valor: los pares siguientes quitan más
+                candidato = self._mejor_entrante(holgura + quitado_w, quitado_v, mejor_ganancia)
+                if candidato is not None:
+                    mejor_ganancia = candidato[0] - quitado_v
+                    mejor = (mejor_ganancia, (s1, s2), (candidato[1],))
+        return mejor
+
+    # ------------------------------------------------------------
+    # Bucle principal
+    # ------------------------------------------------------------
+    def mejorar(self, max_pasadas=None, deadline=None, fases=None):
+        """
+        Aplica la mejor mejora de la primera fase que encuentre una (en el
+        orden 0, 1-por-1, 1-por-k, 2-por-1) y reinicia, hasta llegar a un
+        óptimo local, agotar max_pasadas o pasar el deadline (time.time()).
+        """
+        if fases is None:
+            fases = (self.fase_cero, self.mejor_1x1, self.mejor_1xk, self.mejor_2x1)
+        pasadas = 0
+        while max_pasadas is None or pasadas < max_pasadas:
+            if deadline is not None and time.time() >= deadline:
+                break
+            pasadas += 1
+            for fase in fases:
+                movimiento = fase()
+                if movimiento is not None:
+                    _, quitar, agregar = movimiento
+                    self.mover(quitar, agregar)
+                    break
+            else:
+                break  # óptimo local para todos los vecindarios
+        return self
+
+    def resultado(self):
+        return {
+            "items": sorted(self.seleccion),
+            "total_value": self.total_value,
+            "total_peso_usado": self.total_weight,
+            "solve_time": 0.0
+        }
+
+
+def heuristic(items_state):
+    """
+    Adaptador con la firma de KnapsackSkeleton.heuristic. Si items_state trae
+    "solucion_inicial" se arranca en caliente: se repara, se completa con el
+    greedy y la búsqueda local continúa desde ahí, enfocada en los ítems
+    que cambiaron.
+    """
+    start_time = time.time()
+    inicial = items_state.get("solucion_inicial")
+    motor = MotorBusquedaLocal(items_state["weights"], items_state["values"], items_state["capacity"],
+                               seleccion_inicial=inicial)
+    if inicial is not None:
+        motor.rellenar()
+        # El foco: ítems modificados y los que cambiaron al reparar o completar
+        motor.foco = set(items_state.get("items_modificados", ())) | (set(inicial) ^ motor.seleccion)
+    motor.mejorar(deadline=items_state.get("deadline"))
+    resultado = motor.resultado()
+    resultado["solve_time"] = time.time() - start_time
+    return resultado
@@ -0,0 +1,159 @@
+# cotas_mochila.py
+import numpy as np
+import pandas as pd
+
+
+# ============================================================
+# Cotas superiores para el problema de la mochila 0/1
+#   - Dantzig: relajación lineal (se fracciona el ítem crítico)
+#   - Martello–Toth U2: fija el ítem crítico dentro o fuera
+# Todas las instancias de un DataFrame se procesan en una sola
+# pasada vectorizada (matriz instancias × ítems con relleno).
+# ============================================================
+
+def _densidades(pesos, valores):
+    """
+    Densidad valor/peso con el mismo criterio que las heurísticas:
+    peso 0 y valor > 0 => densidad infinita; peso 0 y valor 0 => densidad 0.
+    """
+    with np.errstate(divide="ignore", invalid="ignore"):
+        densidad = np.where(pesos > 0, valores / np.where(pesos > 0, pesos, 1), 0.0)
+    return np.where((pesos == 0) & (valores > 0), np.inf, densidad)
+
+
+def matrices_ordenadas(lista_pesos, lista_valores):
+    """
+    Construye matrices (instancias × n_max) con los ítems de cada instancia
+    ordenados por densidad decreciente. Las posiciones de relleno tienen
+    peso 0 y valor 0 y quedan siempre al final de la fila.
+
+    Devuelve (pesos, valores, orden, n_items) donde 'orden' contiene los
+    índices originales (-1 en el relleno).
+    """
+    n_items = np.array([len(p) for p in lista_pesos], dtype=np.int64)
+    n_inst = len(n_items)
+    n_max = int(n_items.max()) if n_inst > 0 else 0
+
+    pesos = np.zeros((n_inst, n_max), dtype=float)
+    valores = np.zeros((n_inst, n_max), dtype=float)
+    for k, (p, v) in enumerate(zip(lista_pesos, lista_valores)):
+        pesos[k, :n_items[k]] = p
+        valores[k, :n_items[k]] = v
+
+    relleno = np.arange(n_max)[None, :] >= n_items[:, None]
+    densidad = np.where(relleno, -np.inf, _densidades(pesos, valores))
+
+    orden = np.argsort(-densidad, axis=1, kind="stable")
+    pesos = np.take_along_axis(pesos, orden, axis=1)
+    valores = np.take_along_axis(valores, orden, axis=1)
+    orden = np.where(np.take_along_axis(relleno, orden, axis=1), -1, orden)
+    return pesos, valores, orden, n_items
+
+
+def calcular_cotas(lista_pesos, lista_valores, capacidades, u2=True):
+    """
+    Calcula la cota de Dantzig (y opcionalmente la cota U2 de Martello–Toth)
+    para todas las instancias a la vez.
+
+    Devuelve un diccionario de arreglos (uno por instancia):
+        - "cota_dantzig": valor de la relajación lineal
+        - "cota_u2": cota U2 (solo si u2=True)
+        - "item_critico": posición (en orden de densidad) del ítem crítico,
+          igual a n_items si todos los ítems caben
+    Si todos los valores son enteros las cotas se redondean hacia abajo.
+    """
+    capacidades = np.asarray(capacidades, dtype=float)
+    pesos, valores, _, n_items = matrices_ordenadas(lista_pesos, lista_valores)
+    n_inst, n_max = pesos.shape
+    filas = np.arange(n_inst)
+
+    if n_max == 0:
+        ceros = np.zeros(n_inst)
+        cotas = {"cota_dantzig": ceros, "item_critico": np.zeros(n_inst, dtype=np.int64)}
+        if u2:
+            cotas["cota_u2"] = ceros.copy()
+        return cotas
+
+    peso_acum = np.cumsum(pesos, axis=1)
+    valor_acum = np.cumsum(valores, axis=1)
+    valor_total = valor_acum[:, -1]
+
+    # Ítem crítico s: primer ítem (en orden de densidad) que ya no cabe
+    s = np.sum(peso_acum <= capacidades[:, None], axis=1)
+    s = np.minimum(s, n_items)
+    todos_caben = s >= n_items
+    s_idx = np.minimum(s, n_max - 1)
+
+    valor_previo = np.where(s > 0, valor_acum[filas, np.maximum(s - 1, 0)], 0.0)
+    peso_previo = np.where(s > 0, peso_acum[filas, np.maximum(s - 1, 0)], 0.0)
+    residual = capacidades - peso_previo
+
+    w_s = pesos[filas, s_idx]
+    p_s = valores[filas, s_idx]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        fraccion = np.where(w_s > 0, residual * p_s / np.where(w_s > 0, w_s, 1), 0.0)
+    dantzig = np.where(todos_caben, valor_total, valor_previo + fraccion)
+
+    enteros = bool(np.all(valores == np.floor(valores)))
+    redondear = (lambda x: np.floor(x + 1e-9)) if enteros else (lambda x: x)
+
+    cotas = {"cota_dantzig": redondear(dantzig), "item_critico": s}
+
+    if u2:
+        # U0: el ítem crítico queda fuera, se fracciona el siguiente
+        sig = np.minimum(s + 1, n_max - 1)
+        hay_sig = (s + 1) < n_items
+        w_sig = pesos[filas, sig]
+        p_sig = valores[filas, sig]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            frac_sig = np.where(hay_sig & (w_sig > 0),
+                                residual * p_sig / np.where(w_sig > 0, w_sig, 1), 0.0)
+        u0 = valor_previo + frac_sig
+
+        # U1: el ítem crítico entra, se retira fraccionalmente el anterior
+        ant = np.maximum(s - 1, 0)
+        w_ant = pesos[filas, ant]
+        p_ant = valores[filas, ant]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            u1 = np.where((s > 0) & (w_ant > 0),
+                          valor_previo + p_s - (w_s - residual) * p_ant / np.where(w_ant > 0, w_ant, 1),
+                          -np.inf)
+
+        cota_u2 = np.where(todos_caben, valor_total, np.maximum(u0, u1))
+        cotas["cota_u2"] = redondear(np.minimum(cota_u2, dantzig))
+
+    return cotas
+
+
+def cotas_instancia(weights, values, capacity, u2=True):
+    """Atajo para una sola instancia: devuelve un diccionario de escalares."""
+    cotas = calcular_cotas([list(weights)], [list(values)], [capacity], u2=u2)
+    return {k: v[0].item() for k, v in cotas.items()}
+
+
+def agregar_cotas(df: pd.DataFrame, u2=True) -> pd.DataFrame:
+    """
+    Agrega al DataFrame de instancias las columnas 'cota_dantzig'
+    (y 'cota_u2') para que queden guardadas junto a cada instancia.
+    Modifica el DataFrame recibido y lo devuelve.
+    """
+    cotas = calcular_cotas(df["pesos"].tolist(), df["valores"].tolist(),
+                           df["capacidad"].to_numpy(), u2=u2)
+    df["cota_dantzig"] = cotas["cota_dantzig"]
+    if u2:
+        df["cota_u2"] = cotas["cota_u2"]
+    return df
+
+
+def cota_superior(df: pd.DataFrame) -> np.ndarray:
+    """
+    Mejor cota disponible para cada instancia del DataFrame: usa las columnas
+    ya guardadas si existen y, si no, las calcula en el momento.
+    """
+    if "cota_u2" in df.columns:
+        return df["cota_u2"].to_numpy(dtype=float)
+    if "cota_dantzig" in df.columns:
+        return df["cota_dantzig"].to_numpy(dtype=float)
+    cotas = calcular_cotas(df["pesos"].tolist(), df["valores"].tolist(),
+                           df["capacidad"].to_numpy(), u2=True)
+    return cotas["cota_u2"]
@@ -0,0 +1,118 @@
+# despachador_exacto.py
+import time
+import numpy as np
+
+from dp_mochila import dp_capacidad, dp_beneficios
+from suma_subconjuntos import resolver_suma_subconjuntos
+from solver_mochila import SolverMochila
+from solver_pareto import resolver_pareto
+from solver_mitm import resolver_mitm, MAX_ITEMS_MITM
+
+
+# ============================================================
+# Selección automática del método exacto por instancia
+# Se estima el costo de cada orientación de la DP y se elige
+# la más barata:
+#   - capacidad:  n × C celdas
+#   - beneficios: n × ΣV celdas
+#   - bitset:     n × C / 64 palabras (solo si valor == peso)
+#   - pareto:     n × (estados no dominados estimados) × factor
+#   - mitm:       n × 2^(n/2) × factor (solo n <= MAX_ITEMS_MITM)
+# Los métodos densos se descartan si su vector supera
+# LONGITUD_MAXIMA_DENSA; si nada aplica se usa ramificación y
+# acotamiento.
+# ============================================================
+
+# Largo máximo del vector de una DP densa (capacidades o beneficios)
+LONGITUD_MAXIMA_DENSA = 50_000_000
+
+# Costo relativo de una celda de la frontera de Pareto (fusión y orden)
+# frente a una celda de la DP densa
+FACTOR_PARETO = 20
+
+
+def _es_entero(arreglo):
+    return bool(np.all(arreglo == np.floor(arreglo)))
+
+
+def estimar_costos(weights, values, capacity):
+    """
+    Devuelve un diccionario {metodo: costo estimado} con los métodos
+    aplicables a la instancia (el costo se mide en celdas de DP).
+    """
+    pesos = np.asarray(weights, dtype=float)
+    valores = np.asarray(values, dtype=float)
+    utiles = (pesos <= capacity) & (valores > 0)
+    n = int(utiles.sum())
+    capacidad = int(np.floor(capacity))
+    costos = {}
+
+    # Cantidad de estados no dominados: a lo más 2^n, C + 1 o ΣV + 1
+    estados = 2.0 ** min(n, 1023)
+    estados_mitad = 2.0 ** ((n + 1) // 2)
+    if _es_entero(pesos):
+        estados = min(estados, capacidad + 1)
+        estados_mitad = min(estados_mitad, capacidad + 1)
+        if capacidad + 1 <= LONGITUD_MAXIMA_DENSA:
+            costos["capacidad"] = n * (capacidad + 1)
+            if np.array_equal(pesos, valores):
+                costos["bitset"] = n * (capacidad + 1) // 64
+    if _es_entero(valores):
+        suma_valores = int(valores[utiles].sum())
+        estados = min(estados, suma_valores + 1)
+        estados_mitad = min(estados_mitad, suma_valores + 1)
+        if suma_valores + 1 <= LONGITUD_MAXIMA_DENSA:
+            costos["beneficios"] = n * (suma_valores + 1)
+    if estados <= LONGITUD_MAXIMA_DENSA:
+        costos["pareto"] = FACTOR_PARETO * n * estados
+    if n <= MAX_ITEMS_MITM:
+        costos["mitm"] = FACTOR_PARETO * n * estados_mitad
+    if not costos:
+        costos["branch_and_bound"] = float("inf")
+    return costos
+
+
+def _branch_and_bound(weights, values, capacity):
+    start_time = time.time()
+    res = SolverMochila(values, [weights], [capacity]).resolver()
+    return {
+        "items": res["items"],
+        "total_value": res["valor_total"],
+        "total_peso_usado": res["peso_total"],
+        "solve_time": time.time() - start_time
+    }
+
+
+METODOS = {
+    "capacidad": dp_capacidad,
+    "beneficios": dp_beneficios,
+    "bitset": lambda weights, values, capacity: resolver_suma_subconjuntos(weights, capacity),
+    "pareto": resolver_pareto,
+    "mitm": resolver_mitm,
+    "branch_and_bound": _branch_and_bound,
+}
+
+
+def elegir_metodo(weights, values, capacity):
+    """Nombre del método exacto más barato para la instancia."""
+    costos = estimar_costos(weights, values, capacity)
+    return min(costos, key=costos.get)
+
+
+def resolver_exacto(weights, values, capacity, metodo="auto"):
+    """
+    Resuelve la instancia de forma exacta con el método indicado o, con
+    metodo="auto", con el más barato según estimar_costos().
+    Devuelve un diccionario con el formato de KnapsackSkeleton.solve()
+    más la clave "metodo".
+    """
+    start_time = time.time()
+    if metodo == "auto":
+        metodo = elegir_metodo(weights, values, capacity)
+    if metodo not in METODOS:
+        raise ValueError(f"Método exacto desconocido: {metodo}")
+
+    resultado = METODOS[metodo](list(weights), list(values), capacity)
+    resultado["solve_time"] = time.time() - start_time
+    resultado["metodo"] = metodo
+    return resultado
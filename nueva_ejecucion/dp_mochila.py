@@ -0,0 +1,227 @@
+# dp_mochila.py
+import time
+import numpy as np
+
+
+# ============================================================
+# Programación dinámica exacta por capacidad (mochila 0/1)
+# Requiere pesos enteros. Cada ítem actualiza el vector de
+# mejores valores con una operación vectorizada de NumPy.
+# ============================================================
+
+def _preparar_items(weights, values, capacity, pesos_enteros=True):
+    """
+    Separa los ítems de peso 0 y valor positivo (siempre entran) y descarta
+    los que no caben solos. Devuelve (indices_dp, pesos, valores, capacidad,
+    indices_libres). Con pesos_enteros=False (DP por beneficios) se aceptan
+    pesos reales y la capacidad no se redondea.
+    """
+    pesos = np.asarray(weights)
+    valores = np.asarray(values)
+    enteros = bool(np.all(pesos == np.floor(pesos)))
+    if pesos_enteros and not enteros:
+        raise ValueError("La programación dinámica por capacidad requiere pesos enteros.")
+    capacidad = int(np.floor(capacity)) if enteros else float(capacity)
+
+    libres = np.flatnonzero((pesos == 0) & (valores > 0))
+    indices = np.flatnonzero((pesos > 0) & (pesos <= capacidad) & (valores > 0))
+    tipo_peso = np.int64 if enteros else float
+    tipo_valor = np.int64 if np.all(valores == np.floor(valores)) else float
+    return (indices, pesos[indices].astype(tipo_peso), valores[indices].astype(tipo_valor),
+            capacidad, libres)
+
+
+def _armar_resultado(weights, values, items, start_time):
+    items = sorted(int(i) for i in items)
+    return {
+        "items": items,
+        "total_value": sum(values[i] for i in items),
+        "total_peso_usado": sum(weights[i] for i in items),
+        "solve_time": time.time() - start_time
+    }
+
+
+# Memoria máxima (bytes) para la tabla de decisiones en modo "auto"
+MEMORIA_MAXIMA_TABLA = 256 * 1024 ** 2
+
+
+def memoria_dp(n_items, capacidad, modo):
+    """Estimación en bytes de la memoria de reconstrucción de cada modo."""
+    celdas = n_items * (int(capacidad) + 1)
+    if modo == "tabla":
+        return celdas
+    if modo == "bits":
+        return celdas // 8 + n_items
+    return 8 * 4 * (int(capacidad) + 1)  # hirschberg: unos pocos vectores O(C)
+
+
+def _elegir_modo(n_items, capacidad):
+    if memoria_dp(n_items, capacidad, "tabla") <= MEMORIA_MAXIMA_TABLA // 8:
+        return "tabla"
+    if memoria_dp(n_items, capacidad, "bits") <= MEMORIA_MAXIMA_TABLA:
+        return "bits"
+    return "hirschberg"
+
+
+def _vector_dp(pesos, valores, capacidad):
+    """Mejores valores para capacidades 0..C usando solo O(C) memoria."""
+    mejor = np.zeros(capacidad + 1, dtype=valores.dtype)
+    for w, v in zip(pesos, valores):
+        if w <= capacidad:
+            np.maximum(mejor[w:], mejor[:-w] + v, out=mejor[w:])
+    return mejor
+
+
+def _dp_con_decisiones(pesos, valores, capacidad, empaquetar):
+    """
+    DP con filas de decisión para reconstruir la solución. Con empaquetar=True
+    cada fila se guarda con np.packbits (1 bit por capacidad).
+    Devuelve las posiciones (en pesos/valores) de los ítems elegidos.
+    """
+    n = len(pesos)
+    mejor = np.zeros(capacidad + 1, dtype=valores.dtype)
+    if empaquetar:
+        decisiones = np.zeros((n, (capacidad + 8) // 8), dtype=np.uint8)
+    else:
+        decisiones = np.zeros((n, capacidad + 1), dtype=bool)
+    for k in range(n):
+        w, v = pesos[k], valores[k]
+        if w > capacidad:
+            continue
+        candidato = mejor[:-w] + v
+        mejora = candidato > mejor[w:]
+        mejor[w:] = np.where(mejora, candidato, mejor[w:])
+        if empaquetar:
+            fila = np.zeros(capacidad + 1, dtype=bool)
+            fila[w:] = mejora
+            decisiones[k] = np.packbits(fila)
+        else:
+            decisiones[k, w:] = mejora
+
+    elegidos = []
+    c = capacidad
+    for k in range(n - 1, -1, -1):
+        if empaquetar:
+            tomado = (decisiones[k, c >> 3] >> (7 - (c & 7))) & 1
+        else:
+            tomado = decisiones[k, c]
+        if tomado:
+            elegidos.append(k)
+            c -= pesos[k]
+    return elegidos
+
+
+def _hirschberg(pesos, valores, capacidad, posiciones, elegidos):
+    """
+    Reconstrucción divide y vencerás: se parte la lista de ítems en dos
+    mitades, se calcula el vector DP de cada una (O(C) memoria) y se busca
+    el reparto de capacidad c1 + c2 = C que maximiza la suma. Cada mitad se
+    resuelve recursivamente con su capacidad. Los subproblemas pequeños se
+    resuelven con filas de bits.
+    """
+    n = len(posiciones)
+    if n == 0 or capacidad <= 0:
+        return
+    if memoria_dp(n, capacidad, "bits") <= 1024 ** 2:
+        sub = _dp_con_decisiones(pesos[posiciones], valores[posiciones], capacidad, empaquetar=True)
+        elegidos.extend(posiciones[k] for k in sub)
+        return
+
+    mitad = n // 2
+    izquierda, derecha = posiciones[:mitad], posiciones[mitad:]
+    f = _vector_dp(pesos[izquierda], valores[izquierda], capacidad)
+    g = _vector_dp(pesos[derecha], valores[derecha], capacidad)
+    c1 = int(np.argmax(f + g[::-1]))
+    del f, g
+    _hirschberg(pesos, valores, c1, izquierda, elegidos)
+    _hirschberg(pesos, valores, capacidad - c1, derecha, elegidos)
+
+
+def dp_capacidad(weights, values, capacity, modo="auto"):
+    """
+    DP clásica sobre capacidades 0..C.
+    Devuelve un diccionario con el formato de KnapsackSkeleton.solve().
+
+    modo controla cómo se reconstruye la solución:
+        - "tabla": tabla de decisiones booleana n × C (1 byte por celda)
+        - "bits": filas de decisión empaquetadas (1 bit por celda)
+        - "hirschberg": divide y vencerás, memoria O(C) (≈ 2× el tiempo)
+        - "auto": la opción más rápida que entra en MEMORIA_MAXIMA_TABLA
+    """
+    start_time = time.time()
+    indices, pesos, valores, capacidad, libres = _preparar_items(weights, values, capacity)
+    if modo == "auto":
+        modo = _elegir_modo(len(indices), capacidad)
+
+    if modo == "hirschberg":
+        elegidos = []
+        _hirschberg(pesos, valores, capacidad, np.arange(len(indices)), elegidos)
+    elif modo in ("tabla", "bits"):
+        elegidos = _dp_con_decisiones(pesos, valores, capacidad, empaquetar=(modo == "bits"))
+    else:
+        raise ValueError(f"Modo de DP desconocido: {modo}")
+
+    items = list(libres) + [indices[k] for k in elegidos]
+    return _armar_resultado(weights, values, items, start_time)
+
+
+# ============================================================
+# Programación dinámica por beneficios (mínimo peso por valor)
+# Requiere valores enteros (los pesos pueden ser reales). El
+# vector se indexa por valor total 0..ΣV y guarda el menor peso
+# con el que se alcanza ese valor; conviene cuando ΣV es mucho
+# menor que la capacidad.
+# ============================================================
+
+def dp_beneficios(weights, values, capacity):
+    """
+    DP de mínimo peso por beneficio con filas de decisión empaquetadas
+    (1 bit por celda, n × ΣV bits).
+    Devuelve un diccionario con el formato de KnapsackSkeleton.solve().
+    """
+    start_time = time.time()
+    indices, pesos, valores, capacidad, libres = _preparar_items(weights, values, capacity,
+                                                                 pesos_enteros=False)
+    if valores.dtype != np.int64:
+        raise ValueError("La programación dinámica por beneficios requiere valores enteros.")
+
+    elegidos = _dp_beneficios_con_decisiones(pesos, valores, capacidad)
+    items = list(libres) + [indices[k] for k in elegidos]
+    return _armar_resultado(weights, values, items, start_time)
+
+
+def _dp_beneficios_con_decisiones(pesos, valores, capacidad, tope=None):
+    """
+    Núcleo de dp_beneficios: devuelve las posiciones de los ítems elegidos.
+    Con 'tope' el vector se limita a beneficios 0..tope (útil cuando se
+    conoce una cota superior del óptimo).
+    """
+    n = len(pesos)
+    total = int(valores.sum()) if tope is None else min(int(valores.sum()), int(tope))
+    if np.issubdtype(pesos.dtype, np.integer):
+        min_peso = np.full(total + 1, np.iinfo(np.int64).max // 2, dtype=np.int64)
+    else:
+        min_peso = np.full(total + 1, np.inf)
+    min_peso[0] = 0
+    decisiones = np.zeros((n, (total + 8) // 8), dtype=np.uint8)
+    techo = 0  # mayor valor alcanzado hasta ahora (acota la actualización)
+    for k in range(n):
+        w, v = pesos[k], valores[k]
+        techo = min(techo + v, total)
+        if v > techo:
+            continue
+        candidato = min_peso[:techo - v + 1] + w
+        mejora = candidato < min_peso[v:techo + 1]
+        min_peso[v:techo + 1] = np.where(mejora, candidato, min_peso[v:techo + 1])
+        fila = np.zeros(total + 1, dtype=bool)
+        fila[v:techo + 1] = mejora
+        decisiones[k] = np.packbits(fila)
+
+    beneficio = int(np.flatnonzero(min_peso <= capacidad).max())
+    elegidos = []
+    b = beneficio
+    for k in range(n - 1, -1, -1):
+        if (decisiones[k, b >> 3] >> (7 - (b & 7))) & 1:
+            elegidos.append(k)
+            b -= valores[k]
+    return elegidos
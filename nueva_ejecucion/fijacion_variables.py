@@ -0,0 +1,89 @@
+# fijacion_variables.py
+import numpy as np
+
+
+# ============================================================
+# Fijación de variables por costos reducidos (Dembo–Hammer)
+# Con r = p_s / w_s (densidad del ítem crítico) y U la cota de
+# Dantzig, cambiar el valor LP de un ítem j cuesta al menos
+# |p_j - r * w_j|. Si U - |p_j - r * w_j| <= z (cota inferior),
+# ninguna solución mejor que z puede cambiar a j: se fija en su
+# valor LP (1 antes del ítem crítico, 0 después). Solo los ítems
+# no fijados (el núcleo) pasan a la heurística o al solver.
+# ============================================================
+
+def fijar_variables(weights, values, capacity, cota_inferior=None):
+    """
+    Calcula qué variables se pueden fijar. Devuelve un diccionario con:
+        - "fijos_uno" / "fijos_cero": índices originales fijados
+        - "libres": índices originales del núcleo (ordenados por densidad)
+        - "capacidad_residual": capacidad disponible para los libres
+        - "cota_inferior": valor z usado en la prueba
+        - "incumbente": ítems de la solución que alcanza z
+        - "variables_fijadas": cantidad de variables fijadas
+    Si no se entrega cota_inferior se usa la del greedy por densidad.
+    """
+    pesos = np.asarray(weights, dtype=float)
+    valores = np.asarray(values, dtype=float)
+    enteros = bool(np.all(valores == np.floor(valores)))
+
+    es_siempre = (pesos == 0) & (valores > 0)
+    es_candidato = (pesos > 0) & (pesos <= capacity) & (valores > 0)
+    siempre = np.flatnonzero(es_siempre)
+    nunca = np.flatnonzero(~(es_siempre | es_candidato))
+    candidatos = np.flatnonzero(es_candidato)
+    orden = candidatos[np.argsort(-(valores[candidatos] / pesos[candidatos]), kind="stable")]
+    w, p = pesos[orden], valores[orden]
+    peso_pref = np.concatenate(([0.0], np.cumsum(w)))
+
+    # Ítem crítico y cota de Dantzig
+    s = int(np.searchsorted(peso_pref, capacity, side="right")) - 1
+    if s >= len(orden):
+        # Todo cabe: la solución es trivial y todas las variables quedan fijas
+        fijos_uno = sorted(int(i) for i in np.concatenate((siempre, orden)))
+        return {
+            "fijos_uno": fijos_uno,
+            "fijos_cero": sorted(int(i) for i in nunca),
+            "libres": [],
+            "capacidad_residual": capacity - float(w.sum()),
+            "cota_inferior": float(valores[fijos_uno].sum()),
+            "incumbente": fijos_uno,
+            "variables_fijadas": len(pesos),
+        }
+
+    r = p[s] / w[s]
+    cota_lp = p[:s].sum() + (capacity - peso_pref[s]) * r
+
+    # Incumbente: greedy saltando los ítems que no caben
+    incumbente, usado = [], 0.0
+    for k in range(len(orden)):
+        if usado + w[k] <= capacity:
+            usado += w[k]
+            incumbente.append(k)
+    valor_greedy = float(p[incumbente].sum())
+    valor_siempre = float(valores[siempre].sum())
+    if cota_inferior is None or cota_inferior - valor_siempre < valor_greedy:
+        cota_inferior = valor_greedy
+    else:
+        cota_inferior -= valor_siempre
+
+    cota_invertida = cota_lp - np.abs(p - r * w)
+    if enteros:
+        cota_invertida = np.floor(cota_invertida + 1e-9)
+    fijo = cota_invertida <= cota_inferior
+    fijo[s] = False
+    posiciones = np.arange(len(orden))
+
+    fijos_uno = np.concatenate((siempre, orden[fijo & (posiciones < s)]))
+    fijos_cero = np.concatenate((nunca, orden[fijo & (posiciones > s)]))
+    libres = orden[~fijo]
+    capacidad_residual = capacity - float(pesos[fijos_uno].sum())
+    return {
+        "fijos_uno": sorted(int(i) for i in fijos_uno),
+        "fijos_cero": sorted(int(i) for i in fijos_cero),
+        "libres": [int(i) for i in libres],
+        "capacidad_residual": capacidad_residual,
+        "cota_inferior": cota_inferior + valor_siempre,
+        "incumbente": sorted(int(i) for i in np.concatenate((siempre, orden[incumbente]))),
+        "variables_fijadas": len(pesos) - len(libres),
+    }
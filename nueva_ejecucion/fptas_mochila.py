@@ -0,0 +1,80 @@
+# fptas_mochila.py
+import time
+import numpy as np
+
+from cotas_mochila import cotas_instancia
+from dp_mochila import _dp_beneficios_con_decisiones
+
+
+# ============================================================
+# FPTAS para la mochila 0/1 (escalado de beneficios + DP por
+# beneficios). Garantiza valor >= (1 - epsilon) * óptimo.
+#
+# Se escala con K = epsilon * LB / n, donde LB = max(greedy, vmax)
+# cumple LB >= óptimo / 2. El vector de la DP se limita a
+# U / K <= 2n / epsilon beneficios (U = cota U2), de modo que el
+# costo total es O(n² / epsilon).
+# ============================================================
+
+def fptas(weights, values, capacity, epsilon=0.1):
+    """
+    Resuelve la instancia con garantía (1 - epsilon).
+    Devuelve un diccionario con el formato de KnapsackSkeleton.solve() y la
+    clave "certificado" con la garantía y las cotas del óptimo.
+    """
+    if not 0 < epsilon < 1:
+        raise ValueError("epsilon debe estar en el intervalo (0, 1).")
+    start_time = time.time()
+    pesos = np.asarray(weights, dtype=float)
+    valores = np.asarray(values, dtype=float)
+
+    libres = np.flatnonzero((pesos == 0) & (valores > 0))
+    indices = np.flatnonzero((pesos > 0) & (pesos <= capacity) & (valores > 0))
+    n = len(indices)
+    p = valores[indices]
+    w = pesos[indices]
+    if np.all(w == np.floor(w)):
+        w = w.astype(np.int64)
+
+    # Cota inferior LB = max(greedy, vmax) >= óptimo / 2
+    orden = np.argsort(-(p / w) if n else p, kind="stable")
+    greedy, usado = 0.0, 0.0
+    for k in orden:
+        if usado + w[k] <= capacity:
+            usado += w[k]
+            greedy += p[k]
+    cota_inferior = max(greedy, float(p.max()) if n else 0.0)
+    cota_sup = cotas_instancia(w, p, capacity)["cota_u2"] if n else 0.0
+
+    exacto = False
+    if n == 0 or cota_inferior == 0:
+        elegidos = []
+        escala = 1.0
+        exacto = True
+    else:
+        escala = epsilon * cota_inferior / n
+        enteros = bool(np.all(p == np.floor(p)))
+        if enteros and escala <= 1:
+            escala = 1.0  # los valores ya son pequeños: la DP es exacta
+            exacto = True
+        escalados = np.floor(p / escala).astype(np.int64)
+        tope = int(np.floor(cota_sup / escala)) + 1
+        elegidos = _dp_beneficios_con_decisiones(w, escalados, capacity, tope=tope)
+
+    items = sorted(int(i) for i in list(libres) + [indices[k] for k in elegidos])
+    total_value = sum(values[i] for i in items)
+    valor_libres = float(valores[libres].sum())
+    return {
+        "items": items,
+        "total_value": total_value,
+        "total_peso_usado": sum(weights[i] for i in items),
+        "solve_time": time.time() - start_time,
+        "certificado": {
+            "epsilon": epsilon,
+            "exacto": exacto,
+            "garantia": "total_value >= (1 - epsilon) * optimo",
+            "cota_superior_optimo": min(valor_libres + cota_sup,
+                                        valor_libres + (total_value - valor_libres) / (1 - epsilon)),
+            "factor_escala": escala,
+        }
+    }
@@ -19,6 +19,8 @@ from rich.jupyter import display
 
 from gemini_cliente import Gemini
 from skeleton_knapsack import KnapsackSkeleton
+from cotas_mochila import agregar_cotas, cota_superior
+from suma_subconjuntos import agregar_techo_llenado, techo_llenado
 
 
 # ============================================================
@@ -39,10 +41,91 @@ def cargar_base_pickle(ruta: str) -> pd.DataFrame:
 # 2️⃣ Evaluador de heurística (score normalizado multi-métrica)
 #    + guarda resultados por instancia
 # ============================================================
-def evaluate_candidate(code: str, df_base: pd.DataFrame, iteracion: int, carpeta_salida: str):
+def _nuevo_estado_evaluacion(n_instancias):
+    """
+    Estado compartido entre evaluate_candidate y evaluar_con_timeout:
+    resultado de cada instancia terminada, skeleton de la instancia en curso
+    (su mejor_parcial es el incumbente reportado) y la marca de cancelación,
+    que se consulta bajo el lock antes de escribir o imprimir resultados.
+    """
+    return {
+        "resultados": [None] * n_instancias,
+        "skeleton_actual": None,
+        "inicio_actual": None,
+        "indice_actual": None,
+        "cancelado": threading.Event(),
+        "terminado": False,
+        "lock": threading.Lock()
+    }
+
+
+def _puntuar_instancias(df_base, resultados, iteracion, carpeta_salida):
+    """
+    Calcula el score (mismo criterio para evaluaciones completas o
+    interrumpidas), guarda el detalle por instancia y devuelve el score final.
+    resultados tiene un diccionario por instancia con total_peso_usado,
+    total_value y solve_time.
+    """
+    # Cota superior por instancia (Dantzig / U2) para reportar el gap
+    cotas = cota_superior(df_base)
+
+    # Mejor llenado posible por instancia (techo real de 'eficiencia'; NaN
+    # con pesos no enteros, es solo una columna de diagnóstico)
+    if "peso_max_alcanzable" in df_base.columns:
+        peso_max = df_base["peso_max_alcanzable"].to_numpy(dtype=float)
+    else:
+        peso_max = np.array([techo_llenado(p, c)
+                             for p, c in zip(df_base["pesos"], df_base["capacidad"])], dtype=float)
+    capacidades = df_base["capacidad"].to_numpy(dtype=float)
+
+    eficiencias = [(c - r["total_peso_usado"]) / c for c, r in zip(capacidades, resultados)]
+    tiempos = [r["solve_time"] for r in resultados]
+    valores = [r["total_value"] for r in resultados]
+
+    # Normalización de métricas
+    def minmax(x):
+        x = np.array(x, dtype=float)
+        if x.max() == x.min():
+            return np.ones_like(x)
+        return (x - x.min()) / (x.max() - x.min())
+
+    norm_ef = 1 - minmax(eficiencias)  # menor espacio libre = mejor
+    norm_ti = 1 - minmax(tiempos)      # menor tiempo = mejor
+    norm_val = minmax(valores)         # mayor valor = mejor
+
+    # Score por instancia
+    score_por_instancia = norm_ef + norm_val
+    df_scores = pd.DataFrame({
+        "eficiencia": eficiencias,
+        "eficiencia_minima": (capacidades - peso_max) / capacidades,
+        "tiempo": tiempos,
+        "valor_total": valores,
+        "cota_superior": cotas,
+        "gap_cota": (cotas - np.array(valores, dtype=float)) / np.where(cotas > 0, cotas, 1),
+        "score_instancia": score_por_instancia
+    })
+
+    # Promedio global del score
+    score_final = df_scores["score_instancia"].mean()
+
+    # Guardar detalle por instancia
+    ruta_csv = os.path.join(carpeta_salida, f"resultados_iteracion_{iteracion}.csv")
+    df_scores.to_csv(ruta_csv, index=False)
+
+    print(f"🔹 Iteración {iteracion}: score final = {score_final:.4f} "
+          f"(gap medio vs cota = {df_scores['gap_cota'].mean():.4%})")
+    print(f"📁 Detalle guardado en: {ruta_csv}")
+
+    return float(score_final)
+
+
+def evaluate_candidate(code: str, df_base: pd.DataFrame, iteracion: int, carpeta_salida: str,
+                       presupuesto_instancia=None, estado=None):
     import tempfile
 
     os.makedirs(carpeta_salida, exist_ok=True)
+    if estado is None:
+        estado = _nuevo_estado_evaluacion(len(df_base))
     tmp_dir = tempfile.mkdtemp()
     tmp_path = os.path.join(tmp_dir, "candidate.py")
 
@@ -58,10 +141,10 @@ def evaluate_candidate(code: str, df_base: pd.DataFrame, iteracion: int, carpeta
         if not hasattr(candidate_module, "heuristic"):
             raise AttributeError("El módulo candidato no contiene 'heuristic'.")
 
-        eficiencias, tiempos, valores = [], [], []
-
         # Evaluar heurística sobre todas las instancias
-        for _, row in df_base.iterrows():
+        for k, (_, row) in enumerate(df_base.iterrows()):
+            if estado["cancelado"].is_set():
+                return 0.0
             skeleton = KnapsackSkeleton(
                 weights=row['pesos'],
                 values=row['valores'],
@@ -69,73 +152,83 @@ def evaluate_candidate(code: str, df_base: pd.DataFrame, iteracion: int, carpeta
             )
             skeleton.heuristic = candidate_module.heuristic
             skeleton.create_model()
-            res = skeleton.solve()
-
-            capacidad = row['capacidad']
-            peso_usado = res['total_peso_usado']
-            valor_total = res['total_value']
-            tiempo = res['solve_time']
-
-            eficiencia = (capacidad - peso_usado) / capacidad
-            eficiencias.append(eficiencia)
-            tiempos.append(tiempo)
-            valores.append(valor_total)
-
-        # Normalización de métricas
-        def minmax(x):
-            x = np.array(x, dtype=float)
-            if x.max() == x.min():
-                return np.ones_like(x)
-            return (x - x.min()) / (x.max() - x.min())
-
-        norm_ef = 1 - minmax(eficiencias)  # menor espacio libre = mejor
-        norm_ti = 1 - minmax(tiempos)      # menor tiempo = mejor
-        norm_val = minmax(valores)         # mayor valor = mejor
-
-        # Score por instancia
-        score_por_instancia = norm_ef + norm_val
-        df_scores = pd.DataFrame({
-            "eficiencia": eficiencias,
-            "tiempo": tiempos,
-            "valor_total": valores,
-            "score_instancia": score_por_instancia
-        })
-
-        # Promedio global del score
-        score_final = df_scores["score_instancia"].mean()
-
-        # Guardar detalle por instancia
-        ruta_csv = os.path.join(carpeta_salida, f"resultados_iteracion_{iteracion}.csv")
-        df_scores.to_csv(ruta_csv, index=False)
+            estado["skeleton_actual"], estado["inicio_actual"], estado["indice_actual"] = skeleton, time.time(), k
+            estado["resultados"][k] = skeleton.solve(presupuesto=presupuesto_instancia)
 
-        print(f"🔹 Iteración {iteracion}: score final = {score_final:.4f}")
-        print(f"📁 Detalle guardado en: {ruta_csv}")
-
-        return float(score_final)
+        # Si el timeout ya puntuó con los incumbentes, no se escribe nada más
+        with estado["lock"]:
+            if estado["cancelado"].is_set():
+                return 0.0
+            estado["terminado"] = True
+            return _puntuar_instancias(df_base, estado["resultados"], iteracion, carpeta_salida)
 
     except Exception as e:
-        print(f"❌ Error al evaluar heurística: {e}")
+        if not estado["cancelado"].is_set():
+            print(f"❌ Error al evaluar heurística: {e}")
         return 0.0
 
 
 # ============================================================
 # 3️⃣ Evaluar con timeout (para Windows)
 # ============================================================
+# Fracción del timeout que se reparte como presupuesto entre las instancias
+FRACCION_PRESUPUESTO = 0.8
+
+
+def _resultados_incumbentes(estado):
+    """
+    Resultados por instancia al vencer el timeout: los de las instancias
+    terminadas, el mejor incumbente reportado en la instancia en curso y una
+    solución vacía en las que no alcanzaron a empezar. Devuelve None si no
+    hay ninguna solución reportada.
+    """
+    resultados = list(estado["resultados"])
+    k, skeleton = estado["indice_actual"], estado["skeleton_actual"]
+    if k is not None and resultados[k] is None:
+        parcial = getattr(skeleton, "mejor_parcial", None)
+        if parcial is not None:
+            resultados[k] = dict(parcial, solve_time=time.time() - estado["inicio_actual"])
+    if all(r is None for r in resultados):
+        return None
+    vacio = {"items": [], "total_value": 0, "total_peso_usado": 0, "solve_time": 0.0}
+    return [vacio if r is None else r for r in resultados]
+
+
 def evaluar_con_timeout(code, df, iteracion, carpeta, timeout_sec=120):
-    """Ejecuta evaluate_candidate con límite de tiempo."""
+    """
+    Ejecuta evaluate_candidate con límite de tiempo. Cada instancia recibe un
+    presupuesto (deadline en items_state) para que las heurísticas anytime
+    terminen a tiempo con su mejor solución en lugar de ser abandonadas.
+    Si aun así se excede el límite, se puntúa con las soluciones terminadas
+    y el mejor incumbente reportado (reportar / generador) en la instancia en
+    curso, y el hilo abandonado ya no escribe ni imprime resultados.
+    """
     result = [0.0]
+    presupuesto_instancia = FRACCION_PRESUPUESTO * timeout_sec / max(len(df), 1)
+    estado = _nuevo_estado_evaluacion(len(df))
 
     def _run():
-        result[0] = evaluate_candidate(code, df, iteracion, carpeta)
+        result[0] = evaluate_candidate(code, df, iteracion, carpeta, presupuesto_instancia, estado)
 
-    thread = threading.Thread(target=_run)
+    thread = threading.Thread(target=_run, daemon=True)
     thread.start()
     thread.join(timeout_sec)
 
-    if thread.is_alive():
-        print(f"⚠️ Iteración {iteracion}: tiempo excedido (> {timeout_sec}s). Se omite.")
-        return 0.0
-    return result[0]
+    if not thread.is_alive():
+        return result[0]
+    with estado["lock"]:
+        if estado["terminado"]:
+            # El hilo terminó de puntuar justo al vencer el plazo
+            thread.join()
+            return result[0]
+        estado["cancelado"].set()
+        resultados = _resultados_incumbentes(estado)
+        if resultados is None:
+            print(f"⚠️ Iteración {iteracion}: tiempo excedido (> {timeout_sec}s) sin soluciones reportadas. Se omite.")
+            return 0.0
+        print(f"⚠️ Iteración {iteracion}: tiempo excedido (> {timeout_sec}s). "
+              f"Se puntúa con las mejores soluciones reportadas.")
+        return _puntuar_instancias(df, resultados, iteracion, carpeta)
 
 
 # ============================================================
@@ -173,6 +266,8 @@ def main():
     os.makedirs(carpeta_heuristicas, exist_ok=True)
 
     df_recuperado = cargar_base_pickle(ruta_base)
+    agregar_cotas(df_recuperado)  # cotas Dantzig/U2 calculadas una sola vez
+    agregar_techo_llenado(df_recuperado)  # mejor llenado posible por instancia
     print(df_recuperado.head())
 
     API_KEY = "#colocar su clave de api de gemini#"
@@ -228,6 +323,7 @@ def main():
         5.  **Triple Quotes Forbidden:** Use **only** single-line comments (`#`). **DO NOT** use triple quotes (`'''` or `\"\"\"`) anywhere in the code.
         6.  **Function Signature:** The function signature MUST begin **EXACTLY** with: `def heuristic(items_state):`
         7.  **Required Output:** The function MUST explicitly return a numerical value (float or int) representing the calculated value/score.
+        8.  **Time Budget (anytime):** `items_state` may contain `"deadline"` (a `time.time()` instant) and always contains `"reportar"`, a function that receives a result dictionary. Call `items_state["reportar"](...)` whenever you hold a feasible solution and stop improving once `time.time() >= items_state["deadline"]`, returning the best solution found so far.
         
         {{CODE_TO_IMPROVE}}
         {historial_texto if historial_texto else mejor_code}
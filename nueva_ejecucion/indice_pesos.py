@@ -0,0 +1,104 @@
+# indice_pesos.py
+import heapq
+
+
+# ============================================================
+# Índice por peso para consultas de "mejor ítem que cabe"
+# Los pesos de nuestras instancias son enteros pequeños (1..50),
+# así que se guarda un montículo de máximos por cada peso y un
+# árbol de segmentos con el máximo valor de cada cubeta. La
+# consulta "mejor ítem con peso <= h" es un máximo prefijo en el
+# árbol: O(log W), en lugar de recorrer todos los no seleccionados.
+# ============================================================
+
+_VACIO = (float("-inf"), -1)
+
+
+class IndicePorPeso:
+    """
+    Conjunto dinámico de ítems (índice, peso entero, valor) que responde:
+        - mejor_hasta(h): ítem de mayor valor con peso <= h
+        - mejor_en(w): ítem de mayor valor con peso exactamente w
+    agregar/quitar cuestan O(log n + log W) amortizado (borrado perezoso);
+    si llega un peso mayor que peso_maximo el árbol se reconstruye más grande.
+    """
+
+    def __init__(self, peso_maximo):
+        self._cubetas = {}
+        self._presentes = {}
+        self._construir_arbol(peso_maximo)
+
+    def _construir_arbol(self, peso_maximo):
+        self.peso_maximo = int(peso_maximo)
+        self._tam = 1
+        while self._tam < self.peso_maximo + 1:
+            self._tam *= 2
+        self._arbol = [_VACIO] * (2 * self._tam)
+        for peso in self._cubetas:
+            self._arbol[self._tam + peso] = self._tope(peso)
+        for pos in range(self._tam - 1, 0, -1):
+            self._arbol[pos] = max(self._arbol[2 * pos], self._arbol[2 * pos + 1])
+
+    def __len__(self):
+        return len(self._presentes)
+
+    def __contains__(self, i):
+        return i in self._presentes
+
+    def agregar(self, i, peso, valor):
+        peso = int(peso)
+        if peso < 0:
+            raise ValueError(f"Peso negativo en el índice: {peso}.")
+        if peso > self.peso_maximo:
+            self._construir_arbol(max(peso, 2 * self.peso_maximo))
+        self._presentes[i] = (peso, valor)
+        heapq.heappush(self._cubetas.setdefault(peso, []), (-valor, i))
+        self._actualizar(peso)
+
+    def quitar(self, i):
+        peso, _ = self._presentes.pop(i)
+        self._actualizar(peso)
+
+    def _tope(self, peso):
+        """Mejor (valor, i) vigente de una cubeta, limpiando borrados perezosos."""
+        cubeta = self._cubetas.get(peso)
+        while cubeta:
+            menos_valor, i = cubeta[0]
+            if self._presentes.get(i) == (peso, -menos_valor):
+                return -menos_valor, i
+            heapq.heappop(cubeta)
+        return _VACIO
+
+    def _actualizar(self, peso):
+        pos = self._tam + peso
+        self._arbol[pos] = self._tope(peso)
+        pos //= 2
+        while pos:
+            self._arbol[pos] = max(self._arbol[2 * pos], self._arbol[2 * pos + 1])
+            pos //= 2
+
+    def mejor_hasta(self, peso_max):
+        """(valor, i) del ítem de mayor valor con peso <= peso_max, o None."""
+        if peso_max < 0:
+            return None
+        derecha = min(int(peso_max), self.peso_maximo) + self._tam + 1
+        izquierda = self._tam
+        mejor = _VACIO
+        while izquierda < derecha:
+            if izquierda & 1:
+                mejor = max(mejor, self._arbol[izquierda])
+                izquierda += 1
+            if derecha & 1:
+                derecha -= 1
+                mejor = max(mejor, self._arbol[derecha])
+            izquierda //= 2
+            derecha //= 2
+        return None if mejor[1] < 0 else mejor
+
+    def mejor_en(self, peso):
+        """(valor, i) del ítem de mayor valor con peso exactamente 'peso', o None."""
+        peso = int(peso)
+        if not 0 <= peso <= self.peso_maximo:
+            return None
+        mejor = self._arbol[self._tam + peso]
+        return None if mejor[1] < 0 else mejor
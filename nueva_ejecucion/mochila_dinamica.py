@@ -0,0 +1,158 @@
+# mochila_dinamica.py
+import time
+
+from busqueda_local import MotorBusquedaLocal
+
+
+# ============================================================
+# Mochila dinámica: inserción, borrado y cambios de ítems o de
+# capacidad sin re-resolver desde cero.
+# El estado vive en un MotorBusquedaLocal (listas ordenadas por
+# valor y densidad, índice por peso, solución actual) y cada
+# cambio se atiende con una reparación local:
+#   - ítem nuevo: entra si cabe o se prueba un intercambio 1-por-1
+#     contra los seleccionados de menor valor
+#   - ítem borrado o capacidad mayor: se completa la holgura
+#   - capacidad menor o ítem más pesado: se quitan los de menor
+#     densidad y se completa
+# Cada 'periodo_mejora' cambios se corre la búsqueda local con las
+# fases de best_candidate_code.py enfocada en los ítems tocados,
+# de modo que el costo se amortiza entre las actualizaciones.
+# ============================================================
+
+class DynamicKnapsack:
+    """
+    Mochila 0/1 con actualizaciones incrementales. Los ítems se identifican
+    por el id que devuelve add_item (los iniciales son 0..n-1) y los ids no
+    se reutilizan al borrar.
+    """
+
+    def __init__(self, weights=(), values=(), capacity=0, periodo_mejora=32, max_pasadas=None):
+        weights, values = list(weights), list(values)
+        # Sin ítems iniciales el motor no puede decidir el índice por peso: se
+        # crea igual y se desactiva solo si llega un peso no entero o muy grande
+        self.motor = MotorBusquedaLocal(weights, values, capacity, indice_pesos=True if not weights else None)
+        self.motor.mejorar(max_pasadas=max_pasadas)
+        self.motor.foco = set()
+        self.periodo_mejora = periodo_mejora
+        self.max_pasadas = max_pasadas
+        self.cambios_pendientes = 0
+
+    # ------------------------------------------------------------
+    # API de actualización
+    # ------------------------------------------------------------
+    def add_item(self, weight, value):
+        """Agrega un ítem y devuelve su id."""
+        i = self.motor.agregar_item(weight, value)
+        self._insertar(i)
+        self._registrar_cambio(i)
+        return i
+
+    def remove_item(self, item_id):
+        """Elimina el ítem item_id; si estaba seleccionado se completa la holgura."""
+        self._validar(item_id)
+        seleccionado = item_id in self.motor.seleccion
+        self.motor.quitar_item(item_id)
+        if seleccionado:
+            self._completar()
+        self._registrar_cambio()
+
+    def update_item(self, item_id, weight, value):
+        """Cambia peso y valor del ítem item_id."""
+        self._validar(item_id)
+        self.motor.actualizar_item(item_id, weight, value)
+        if item_id in self.motor.seleccion:
+            self.motor.reparar()
+            self._completar()
+        else:
+            self._insertar(item_id)
+        self._registrar_cambio(item_id)
+
+    def set_capacity(self, capacity):
+        """Cambia la capacidad: repara si sobra peso y completa si sobra espacio."""
+        self.motor.capacity = capacity
+        self.motor.reparar()
+        self._completar()
+        self._registrar_cambio()
+
+    def optimize(self, max_pasadas=None):
+        """Búsqueda local enfocada en los ítems tocados desde la última optimización."""
+        self.motor.mejorar(max_pasadas=self.max_pasadas if max_pasadas is None else max_pasadas)
+        self.motor.foco = set()
+        self.cambios_pendientes = 0
+        return self
+
+    # ------------------------------------------------------------
+    # Consultas
+    # ------------------------------------------------------------
+    def solve(self):
+        """Solución actual con el formato de KnapsackSkeleton.solve()."""
+        start_time = time.time()
+        resultado = self.motor.resultado()
+        resultado["solve_time"] = time.time() - start_time
+        return resultado
+
+    @property
+    def capacity(self):
+        return self.motor.capacity
+
+    @property
+    def total_value(self):
+        return self.motor.total_value
+
+    @property
+    def total_weight(self):
+        return self.motor.total_weight
+
+    @property
+    def critical_item(self):
+        """Id del ítem crítico: el no seleccionado de mayor densidad (None si no hay)."""
+        if not len(self.motor.no_sel_densidad):
+            return None
+        return self.motor.no_sel_densidad[0][2]
+
+    def __len__(self):
+        return len(self.motor.weights) - len(self.motor.inactivos)
+
+    # ------------------------------------------------------------
+    # Reparaciones locales
+    # ------------------------------------------------------------
+    def _validar(self, item_id):
+        if not 0 <= item_id < len(self.motor.weights) or item_id in self.motor.inactivos:
+            raise KeyError(f"Ítem inexistente o eliminado: {item_id}")
+
+    def _insertar(self, u):
+        """Un ítem no seleccionado entra si cabe o por el mejor intercambio 1-por-1."""
+        motor = self.motor
+        w_u, v_u = motor.weights[u], motor.values[u]
+        if v_u <= 0:
+            return
+        holgura = motor.holgura
+        if w_u <= holgura:
+            motor.mover((), (u,))
+            return
+        # Seleccionados por valor ascendente: el primero factible es el mejor socio
+        for v_s, w_s, s in motor.sel:
+            if v_s >= v_u:
+                break
+            if w_u - w_s <= holgura:
+                motor.mover((s,), (u,))
+                return
+
+    def _completar(self):
+        """Llena la holgura: con el índice por peso, el mejor ítem que cabe; si no, greedy por densidad."""
+        motor = self.motor
+        if motor.indice is None:
+            motor.rellenar()
+            return
+        while True:
+            candidato = motor.indice.mejor_hasta(motor.holgura)
+            if candidato is None or candidato[0] <= 0:
+                break
+            motor.mover((), (candidato[1],))
+
+    def _registrar_cambio(self, *items):
+        self.motor.foco.update(items)
+        self.cambios_pendientes += 1
+        if self.cambios_pendientes >= self.periodo_mejora:
+            self.optimize()
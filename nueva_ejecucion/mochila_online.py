@@ -0,0 +1,286 @@
+# mochila_online.py
+import math
+import time
+import numpy as np
+
+from skeleton_knapsack import KnapsackSkeleton
+
+
+# ============================================================
+# Mochila online: los ítems llegan de a uno y se decide (aceptar
+# o rechazar, sin vuelta atrás) al llegar o, con lookahead, tras
+# ver a lo más 'lookahead' ítems más.
+# Política "umbral": se acepta un ítem que cabe si su densidad
+# supera un umbral que se adapta a lo observado. El umbral es la
+# densidad en que el peso esperado de los ítems que faltan por
+# decidir con densidad mayor alcanza la holgura:
+#     (faltan / vistos) · Σ{w_j : d_j ≥ umbral} ≈ holgura
+# Las densidades vistas se resumen en un histograma de BINS_DENSIDAD
+# cubetas en escala log2 con el peso acumulado de cada una: agregar
+# un ítem es O(1) y calcular el umbral es O(cubetas), sin importar
+# cuántos ítems se hayan visto (dentro de la cubeta se interpola).
+# Así el umbral sube cuando queda poca capacidad relativa a lo
+# que falta y baja hacia el final del flujo. Si no se conoce el
+# largo del flujo se supone que faltan tantos como los vistos.
+# Con lookahead, antes de aceptar el ítem más antiguo del buffer
+# se reserva la holgura para los ítems del buffer más densos que
+# también superan el umbral.
+# Política "greedy": se acepta todo lo que cabe (línea base).
+# ============================================================
+
+POLITICAS = ("umbral", "greedy")
+
+# Histograma de densidades: cubetas de log2(densidad) en [LOG2_MIN, LOG2_MAX)
+BINS_DENSIDAD = 1024
+LOG2_MIN, LOG2_MAX = -32.0, 32.0
+
+
+class MochilaOnline:
+    """
+    Resolución en flujo de la mochila 0/1. Los ítems se identifican por su
+    orden de llegada (0, 1, 2, ...). ofrecer() y finalizar() devuelven las
+    decisiones tomadas en esa llamada como pares (id, aceptado).
+    """
+
+    def __init__(self, capacity, politica="umbral", lookahead=0, n_esperado=None, periodo_umbral=8):
+        if politica not in POLITICAS:
+            raise ValueError(f"Política desconocida: {politica}. Use 'umbral' o 'greedy'.")
+        if lookahead < 0:
+            raise ValueError("lookahead debe ser mayor o igual a 0.")
+        self.capacity = capacity
+        self.politica = politica
+        self.lookahead = lookahead
+        self.n_esperado = n_esperado
+        self.periodo_umbral = max(1, periodo_umbral)
+
+        self.weights, self.values = [], []
+        self.items = []
+        self.total_value = 0
+        self.total_weight = 0
+        self.decididos = 0
+        self.buffer = []  # ids pendientes, en orden de llegada
+        self.finalizado = False
+
+        # Estadística observada: peso por cubeta de densidad y umbral vigente
+        self.peso_bins = np.zeros(BINS_DENSIDAD)
+        self.vistos = 0
+        self.umbral = 0.0
+        self.sin_recalcular = 0
+        self.tiempo_total = 0.0
+        self.latencia_max = 0.0
+
+    @property
+    def holgura(self):
+        return self.capacity - self.total_weight
+
+    # ------------------------------------------------------------
+    # API de flujo
+    # ------------------------------------------------------------
+    def ofrecer(self, weight, value):
+        """Recibe el siguiente ítem y devuelve las decisiones que se toman ahora."""
+        if self.finalizado:
+            raise RuntimeError("El flujo ya fue finalizado.")
+        inicio = time.perf_counter()
+        i = len(self.weights)
+        self.weights.append(weight)
+        self.values.append(value)
+        if self.politica == "umbral":
+            self._observar(weight, value)
+
+        decisiones = []
+        self.buffer.append(i)
+        if len(self.buffer) > self.lookahead:
+            j = self.buffer.pop(0)
+            decisiones.append((j, self._decidir(j)))
+        self._medir(inicio)
+        return decisiones
+
+    def finalizar(self):
+        """
+        Cierra el flujo: los ítems del buffer se deciden con un greedy por
+        densidad sobre la holgura (ya no llegarán más ítems).
+        """
+        inicio = time.perf_counter()
+        pendientes = sorted(self.buffer, key=lambda j: self._densidad(self.weights[j], self.values[j]),
+                            reverse=True)
+        aceptados = set()
+        for j in pendientes:
+            if self.values[j] > 0 and self.weights[j] <= self.holgura:
+                self._aceptar(j)
+                aceptados.add(j)
+        decisiones = [(j, j in aceptados) for j in self.buffer]
+        self.decididos += len(self.buffer)
+        self.buffer = []
+        self.finalizado = True
+        self._medir(inicio)
+        return decisiones
+
+    def resultado(self):
+        """Ítems aceptados con el formato de KnapsackSkeleton.solve() más las latencias."""
+        n = len(self.weights)
+        return {
+            "items": sorted(self.items),
+            "total_value": self.total_value,
+            "total_peso_usado": self.total_weight,
+            "solve_time": self.tiempo_total,
+            "latencia_media": self.tiempo_total / n if n else 0.0,
+            "latencia_max": self.latencia_max,
+            "pendientes": len(self.buffer)
+        }
+
+    # ------------------------------------------------------------
+    # Decisión
+    # ------------------------------------------------------------
+    @staticmethod
+    def _densidad(w, v):
+        return v / w if w > 0 else (float("inf") if v > 0 else 0.0)
+
+    def _observar(self, w, v):
+        d = self._densidad(w, v)
+        if d <= 0:
+            k = 0
+        elif d == float("inf"):
+            k = BINS_DENSIDAD - 1
+        else:
+            x = (math.log2(d) - LOG2_MIN) * BINS_DENSIDAD / (LOG2_MAX - LOG2_MIN)
+            k = min(max(int(x), 0), BINS_DENSIDAD - 1)
+        self.peso_bins[k] += w
+        self.vistos += 1
+        self.sin_recalcular += 1
+        if self.sin_recalcular >= self.periodo_umbral or self.vistos <= self.periodo_umbral:
+            self._recalcular_umbral()
+
+    def _recalcular_umbral(self):
+        """Densidad en que el peso esperado de lo que falta por decidir cubre la holgura."""
+        self.sin_recalcular = 0
+        if self.n_esperado is None:
+            faltan = self.vistos
+        else:
+            faltan = max(self.n_esperado - self.decididos, len(self.buffer), 1)
+        objetivo = self.holgura * self.vistos / faltan
+        # Peso acumulado desde la cubeta más densa hacia abajo
+        acumulado = np.cumsum(self.peso_bins[::-1])
+        r = int(np.searchsorted(acumulado, objetivo))
+        if r >= BINS_DENSIDAD:
+            self.umbral = 0.0
+            return
+        k = BINS_DENSIDAD - 1 - r
+        previo = acumulado[r - 1] if r else 0.0
+        fraccion = (objetivo - previo) / self.peso_bins[k] if self.peso_bins[k] > 0 else 1.0
+        paso = (LOG2_MAX - LOG2_MIN) / BINS_DENSIDAD
+        self.umbral = 2.0 ** (LOG2_MIN + (k + 1 - min(max(fraccion, 0.0), 1.0)) * paso)
+
+    def _decidir(self, j):
+        w, v = self.weights[j], self.values[j]
+        self.decididos += 1
+        if v <= 0 or w > self.holgura:
+            return False
+        if self.politica == "umbral":
+            d = self._densidad(w, v)
+            if d < self.umbral:
+                return False
+            if w > self.holgura - self._reserva(d):
+                return False
+        self._aceptar(j)
+        return True
+
+    def _reserva(self, d):
+        """Peso de los ítems del buffer más densos que d (y sobre el umbral) que caben."""
+        reserva = 0
+        mejores = [(self._densidad(self.weights[k], self.values[k]), self.weights[k]) for k in self.buffer]
+        for d_k, w_k in sorted(mejores, reverse=True):
+            if d_k <= d or d_k < self.umbral:
+                break
+            if reserva + w_k <= self.holgura:
+                reserva += w_k
+        return reserva
+
+    def _aceptar(self, j):
+        self.items.append(j)
+        self.total_weight += self.weights[j]
+        self.total_value += self.values[j]
+
+    def _medir(self, inicio):
+        transcurrido = time.perf_counter() - inicio
+        self.tiempo_total += transcurrido
+        self.latencia_max = max(self.latencia_max, transcurrido)
+
+
+def resolver_online(weights, values, capacity, politica="umbral", lookahead=0, conocer_largo=True, **parametros):
+    """
+    Entrega los ítems en orden de índice a una MochilaOnline y devuelve su
+    resultado. Con conocer_largo=True la política sabe cuántos ítems llegarán.
+    """
+    mochila = MochilaOnline(capacity, politica=politica, lookahead=lookahead,
+                            n_esperado=len(weights) if conocer_largo else None, **parametros)
+    for w, v in zip(weights, values):
+        mochila.ofrecer(w, v)
+    mochila.finalizar()
+    return mochila.resultado()
+
+
+def heuristic(items_state):
+    """
+    Adaptador con la firma de KnapsackSkeleton.heuristic: trata los ítems
+    como un flujo en orden de índice. Lee de items_state (si existen)
+    "politica_online" y "lookahead".
+    """
+    return resolver_online(items_state["weights"], items_state["values"], items_state["capacity"],
+                           politica=items_state.get("politica_online", "umbral"),
+                           lookahead=items_state.get("lookahead", 0))
+
+
+# ============================================================
+# Benchmark: online vs. la mejor heurística offline
+# ============================================================
+
+def benchmark_online(n_lotes=20, items_por_lote=400, lookaheads=(0, 8, 32), semilla=0,
+                     generador=None, heuristica_offline=None):
+    """
+    Genera flujos con GeneradorLotesMochila y compara, por lote, el valor y la
+    latencia de cada política online (umbral con cada lookahead y greedy) con
+    la heurística offline (por defecto la de best_candidate_code.py) resuelta
+    con KnapsackSkeleton. Devuelve un DataFrame con una fila por lote y política.
+    """
+    import numpy as np
+    import pandas as pd
+    from generadorMuestrasUniformes import GeneradorLotesMochila
+
+    if heuristica_offline is None:
+        from best_candidate_code import heuristic as heuristica_offline
+    if generador is None:
+        generador = GeneradorLotesMochila()
+    np.random.seed(semilla)
+    df = generador.generar_lotes(n_lotes, items_por_lote)
+
+    configuraciones = [("umbral", k) for k in lookaheads] + [("greedy", 0)]
+    registros = []
+    for _, row in df.iterrows():
+        skeleton = KnapsackSkeleton(row["pesos"], row["valores"], row["capacidad"])
+        skeleton.heuristic = heuristica_offline
+        offline = skeleton.solve()
+
+        for politica, lookahead in configuraciones:
+            res = resolver_online(row["pesos"], row["valores"], row["capacidad"],
+                                  politica=politica, lookahead=lookahead)
+            registros.append({
+                "lote_id": row["lote_id"],
+                "politica": politica,
+                "lookahead": lookahead,
+                "valor": res["total_value"],
+                "valor_offline": offline["total_value"],
+                "razon": res["total_value"] / offline["total_value"] if offline["total_value"] else 1.0,
+                "latencia_media_us": res["latencia_media"] * 1e6,
+                "latencia_max_us": res["latencia_max"] * 1e6,
+                "tiempo_total": res["solve_time"],
+                "tiempo_offline": offline["solve_time"]
+            })
+    return pd.DataFrame(registros)
+
+
+if __name__ == "__main__":
+    resultados = benchmark_online()
+    resumen = resultados.groupby(["politica", "lookahead"])[
+        ["razon", "latencia_media_us", "latencia_max_us", "tiempo_total", "tiempo_offline"]].mean()
+    print("📊 Mochila online vs. heurística offline (promedio por lote):")
+    print(resumen.to_string())
@@ -0,0 +1,140 @@
+# multiarranque.py
+import os
+import random
+import time
+import multiprocessing as mp
+
+from busqueda_local import MotorBusquedaLocal
+
+
+# ============================================================
+# Búsqueda local multiarranque en paralelo
+# Cada proceso repite: leer el incumbente compartido, perturbarlo
+# (quitar una fracción de sus ítems y rellenar con un greedy por
+# densidad con ruido) o, a veces, arrancar desde cero con ese
+# greedy aleatorio; luego mejora con MotorBusquedaLocal (las
+# fases de best_candidate_code.py). El incumbente (valor y
+# selección) vive en memoria compartida protegida por un lock.
+# Se detiene por tiempo o cuando ningún proceso mejora en
+# max_sin_mejora arranques consecutivos.
+# ============================================================
+
+# Estado compartido de cada proceso del pool (se asigna en _iniciar_trabajador)
+_compartido = {}
+
+
+def _iniciar_trabajador(weights, values, capacity, valor, seleccion, sin_mejora, lock, config):
+    _compartido.update(weights=weights, values=values, capacity=capacity, valor=valor,
+                       seleccion=seleccion, sin_mejora=sin_mejora, lock=lock, config=config)
+
+
+def _greedy_aleatorio(weights, values, capacity, base, excluidos, rng, ruido):
+    """Completa 'base' con un greedy por densidad perturbada con ruido multiplicativo."""
+    seleccion = set(base)
+    usado = sum(weights[i] for i in seleccion)
+    candidatos = [i for i in range(len(weights)) if i not in seleccion and i not in excluidos]
+    clave = {}
+    for i in candidatos:
+        d = values[i] / weights[i] if weights[i] > 0 else float("inf")
+        clave[i] = d * (1.0 + ruido * rng.random())
+    for i in sorted(candidatos, key=clave.__getitem__, reverse=True):
+        if usado + weights[i] <= capacity:
+            seleccion.add(i)
+            usado += weights[i]
+    return seleccion
+
+
+def _perturbar(incumbente, weights, values, capacity, rng, config):
+    """Quita una fracción aleatoria del incumbente y rellena con greedy aleatorio."""
+    if not incumbente or rng.random() < config["prob_reinicio"]:
+        return _greedy_aleatorio(weights, values, capacity, (), (), rng, config["ruido"])
+    k = max(1, int(config["fuerza"] * len(incumbente)))
+    quitados = set(rng.sample(sorted(incumbente), min(k, len(incumbente))))
+    return _greedy_aleatorio(weights, values, capacity, incumbente - quitados, quitados, rng, config["ruido"])
+
+
+def _publicar(motor, valor, seleccion, sin_mejora, lock):
+    """Actualiza el incumbente compartido si el motor lo mejora. Devuelve True si mejoró."""
+    with lock:
+        if motor.total_value > valor.value:
+            valor.value = motor.total_value
+            for i in range(len(seleccion)):
+                seleccion[i] = 1 if i in motor.seleccion else 0
+            sin_mejora.value = 0
+            return True
+        sin_mejora.value += 1
+        return False
+
+
+def _trabajador(semilla):
+    """Bucle de arranques de un proceso. Devuelve (arranques, mejoras)."""
+    c = _compartido
+    config = c["config"]
+    rng = random.Random(semilla)
+    arranques = mejoras = 0
+    while time.time() < config["deadline"] and c["sin_mejora"].value < config["max_sin_mejora"]:
+        with c["lock"]:
+            incumbente = {i for i in range(len(c["seleccion"])) if c["seleccion"][i]}
+        inicio = _perturbar(incumbente, c["weights"], c["values"], c["capacity"], rng, config)
+        motor = MotorBusquedaLocal(c["weights"], c["values"], c["capacity"], seleccion_inicial=inicio)
+        motor.mejorar(deadline=config["deadline"])
+        arranques += 1
+        mejoras += _publicar(motor, c["valor"], c["seleccion"], c["sin_mejora"], c["lock"])
+    return arranques, mejoras
+
+
+def multiarranque(weights, values, capacity, n_procesos=None, tiempo_limite=10.0, deadline=None,
+                  max_sin_mejora=200, fuerza=0.1, ruido=0.3, prob_reinicio=0.1, semilla=None):
+    """
+    Búsqueda local multiarranque sobre n_procesos procesos (por defecto todos
+    los núcleos). Se detiene al pasar tiempo_limite segundos (o el deadline
+    absoluto, si se entrega) o tras max_sin_mejora arranques seguidos sin
+    mejorar el incumbente. Devuelve un diccionario con el formato de
+    KnapsackSkeleton.solve() más "arranques", "mejoras" y "procesos".
+    """
+    start_time = time.time()
+    weights, values = list(weights), list(values)
+    if n_procesos is None:
+        n_procesos = os.cpu_count() or 1
+    if deadline is None:
+        deadline = start_time + tiempo_limite
+    config = {"deadline": deadline, "max_sin_mejora": max_sin_mejora, "fuerza": fuerza,
+              "ruido": ruido, "prob_reinicio": prob_reinicio}
+
+    # Incumbente inicial: la búsqueda local determinista desde el greedy
+    motor = MotorBusquedaLocal(weights, values, capacity).mejorar(deadline=deadline)
+    valor = mp.Value("d", float(motor.total_value), lock=False)
+    seleccion = mp.Array("b", [1 if i in motor.seleccion else 0 for i in range(len(weights))], lock=False)
+    sin_mejora = mp.Value("i", 0, lock=False)
+    lock = mp.Lock()
+    args = (weights, values, capacity, valor, seleccion, sin_mejora, lock, config)
+
+    rng = random.Random(semilla)
+    semillas = [rng.randrange(2 ** 31) for _ in range(n_procesos)]
+    if n_procesos == 1:
+        _iniciar_trabajador(*args)
+        conteos = [_trabajador(semillas[0])]
+    else:
+        with mp.Pool(n_procesos, initializer=_iniciar_trabajador, initargs=args) as pool:
+            conteos = pool.map(_trabajador, semillas)
+
+    items = [i for i in range(len(weights)) if seleccion[i]]
+    return {
+        "items": items,
+        "total_value": sum(values[i] for i in items),
+        "total_peso_usado": sum(weights[i] for i in items),
+        "solve_time": time.time() - start_time,
+        "arranques": sum(a for a, _ in conteos),
+        "mejoras": sum(m for _, m in conteos),
+        "procesos": n_procesos
+    }
+
+
+def heuristic(items_state):
+    """
+    Adaptador con la firma de KnapsackSkeleton.heuristic. Usa el deadline de
+    items_state si existe; si no, "tiempo_limite" (por defecto 2 segundos).
+    """
+    return multiarranque(items_state["weights"], items_state["values"], items_state["capacity"],
+                         tiempo_limite=items_state.get("tiempo_limite", 2.0),
+                         deadline=items_state.get("deadline"))
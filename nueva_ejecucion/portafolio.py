@@ -0,0 +1,232 @@
+# portafolio.py
+import glob
+import hashlib
+import os
+import queue
+import time
+import multiprocessing as mp
+
+import pandas as pd
+
+from cotas_mochila import cotas_instancia
+from skeleton_knapsack import KnapsackSkeleton
+
+
+# ============================================================
+# Portafolio de heurísticas en paralelo
+# Distintas heurísticas archivadas por FunSearch ganan en
+# distintas instancias. El portafolio ejecuta un conjunto de
+# ellas a la vez en un pool de procesos sobre cada instancia y
+# se queda con la mejor solución factible:
+#   - el código de cada heurística se compila una sola vez por
+#     proceso (inicializador del pool); las copias idénticas del
+#     archivo se descartan
+#   - cada ejecución recibe el deadline de la instancia (protocolo
+#     anytime de KnapsackSkeleton.solve con presupuesto)
+#   - si una solución alcanza la cota superior U2 es óptima: se
+#     cancelan las ejecuciones pendientes
+#   - al pasar el deadline también se cancelan; cancelar termina
+#     el pool, que se vuelve a crear para la siguiente instancia
+# ============================================================
+
+# Imports que evaluate_candidate antepone al código generado
+PREAMBULO = "import math\nimport random\nimport time\nimport numpy as np\n"
+
+CARPETA_HEURISTICAS = "salida_heuristicas"
+ARCHIVO_RESULTADOS = "resultados_funsearch.csv"
+
+# Heurísticas compiladas en cada proceso del pool (se asigna en _iniciar_trabajador)
+_heuristicas = {}
+
+
+def seleccionar_heuristicas(top_k=8, incluir_best=True, carpeta=CARPETA_HEURISTICAS,
+                            archivo_resultados=ARCHIVO_RESULTADOS):
+    """
+    Arma el portafolio como {nombre: código}: las variantes best_candidate_code*.py
+    (si incluir_best) y las top_k heurísticas archivadas con mejor score_final
+    en archivo_resultados (todas si top_k es None). Las heurísticas con código
+    idéntico a otra ya elegida se omiten.
+    """
+    rutas = sorted(glob.glob("best_candidate_code*.py")) if incluir_best else []
+    if os.path.exists(archivo_resultados):
+        df = pd.read_csv(archivo_resultados)
+        df = df[(df["estado"] == "OK") & df["archivo"].notna()]
+        df = df.sort_values("score_final", ascending=False, kind="stable")
+        archivadas = [os.path.join(carpeta, a) for a in df["archivo"]]
+    else:
+        archivadas = sorted(glob.glob(os.path.join(carpeta, "heuristica_iter*.py")))
+
+    codigos, vistos = {}, set()
+    elegidas = 0
+    for ruta in rutas + archivadas:
+        es_archivada = ruta not in rutas
+        if es_archivada and top_k is not None and elegidas >= top_k:
+            break
+        if not os.path.exists(ruta):
+            continue
+        with open(ruta, encoding="utf-8") as f:
+            codigo = f.read()
+        huella = hashlib.sha1(codigo.encode("utf-8")).hexdigest()
+        if huella in vistos:
+            continue
+        vistos.add(huella)
+        codigos[os.path.splitext(os.path.basename(ruta))[0]] = codigo
+        elegidas += es_archivada
+    return codigos
+
+
+def _compilar(nombre, codigo):
+    espacio = {}
+    exec(compile(PREAMBULO + codigo, nombre, "exec"), espacio)
+    if "heuristic" not in espacio:
+        raise AttributeError(f"La heurística {nombre} no define 'heuristic'.")
+    return espacio["heuristic"]
+
+
+def _iniciar_trabajador(codigos):
+    _heuristicas.clear()
+    for nombre, codigo in codigos.items():
+        try:
+            _heuristicas[nombre] = _compilar(nombre, codigo)
+        except Exception as e:
+            _heuristicas[nombre] = e
+
+
+def _ejecutar(nombre, weights, values, capacity, deadline):
+    """Resuelve la instancia con una heurística del portafolio. Devuelve (nombre, items, tiempo, error)."""
+    heuristica = _heuristicas[nombre]
+    if isinstance(heuristica, Exception):
+        return nombre, [], 0.0, str(heuristica)
+    skeleton = KnapsackSkeleton(weights, values, capacity)
+    skeleton.heuristic = heuristica
+    presupuesto = None if deadline is None else max(deadline - time.time(), 0.0)
+    res = skeleton.solve(presupuesto=presupuesto)
+    return nombre, list(res.get("items", [])), res["solve_time"], res.get("error")
+
+
+class Portafolio:
+    """
+    Ejecuta en paralelo un conjunto de heurísticas ({nombre: código}, por
+    defecto seleccionar_heuristicas()) sobre cada instancia. Se usa como
+    context manager para cerrar el pool al terminar.
+    """
+
+    def __init__(self, codigos=None, n_procesos=None):
+        self.codigos = seleccionar_heuristicas() if codigos is None else dict(codigos)
+        if not self.codigos:
+            raise ValueError("El portafolio no tiene heurísticas.")
+        self.n_procesos = n_procesos or min(os.cpu_count() or 1, len(self.codigos))
+        self.pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.cerrar()
+
+    def cerrar(self):
+        if self.pool is not None:
+            self.pool.terminate()
+            self.pool.join()
+            self.pool = None
+
+    def _obtener_pool(self):
+        if self.pool is None:
+            self.pool = mp.Pool(self.n_procesos, initializer=_iniciar_trabajador, initargs=(self.codigos,))
+        return self.pool
+
+    def resolver(self, weights, values, capacity, presupuesto=None, certificar=True):
+        """
+        Ejecuta todas las heurísticas sobre la instancia y devuelve la mejor
+        solución factible con el formato de KnapsackSkeleton.solve() más
+        "heuristica" (la ganadora), "optimo_certificado", "cota_superior",
+        "completadas", "canceladas", "valores" ({nombre: valor}; None si
+        la heurística no entregó una solución factible) y "errores"
+        ({nombre: mensaje}). Si una heurística falla después de reportar un
+        incumbente, KnapsackSkeleton.solve() lo devuelve junto al error y ese
+        incumbente se evalúa como cualquier otra solución.
+        """
+        start_time = time.time()
+        weights, values = list(weights), list(values)
+        deadline = None if presupuesto is None else start_time + presupuesto
+        cota = cotas_instancia(weights, values, capacity)["cota_u2"] if certificar else None
+
+        resultados = queue.Queue()
+        pool = self._obtener_pool()
+        for nombre in self.codigos:
+            pool.apply_async(_ejecutar, (nombre, weights, values, capacity, deadline),
+                             callback=resultados.put,
+                             error_callback=lambda e, nombre=nombre: resultados.put((nombre, [], 0.0, str(e))))
+
+        mejor = {"items": [], "total_value": 0, "total_peso_usado": 0, "heuristica": None}
+        valores, errores = {}, {}
+        certificado = False
+        while len(valores) < len(self.codigos):
+            espera = None if deadline is None else deadline - time.time()
+            if espera is not None and espera <= 0:
+                break
+            try:
+                nombre, items, _, error = resultados.get(timeout=espera)
+            except queue.Empty:
+                break
+            if error is not None:
+                errores[nombre] = error
+            valores[nombre] = self._evaluar(weights, values, capacity, items, error)
+            if valores[nombre] is not None and (mejor["heuristica"] is None or valores[nombre] > mejor["total_value"]):
+                items = sorted(set(int(i) for i in items))
+                mejor = {"items": items, "total_value": valores[nombre],
+                         "total_peso_usado": sum(weights[i] for i in items), "heuristica": nombre}
+            if cota is not None and mejor["heuristica"] is not None and mejor["total_value"] >= cota - 1e-9:
+                certificado = True
+                break
+
+        canceladas = len(self.codigos) - len(valores)
+        if canceladas:
+            self.cerrar()
+        mejor.update(solve_time=time.time() - start_time, optimo_certificado=certificado,
+                     cota_superior=cota, completadas=len(valores), canceladas=canceladas,
+                     valores=valores, errores=errores)
+        return mejor
+
+    @staticmethod
+    def _evaluar(weights, values, capacity, items, error):
+        """
+        Valor de la solución si es válida y factible; None en otro caso. Con
+        error y sin ítems la heurística no dejó incumbente: también es None.
+        """
+        if error is not None and not items:
+            return None
+        try:
+            items = set(int(i) for i in items)
+        except (TypeError, ValueError):
+            return None
+        if any(i < 0 or i >= len(weights) for i in items):
+            return None
+        if sum(weights[i] for i in items) > capacity:
+            return None
+        return sum(values[i] for i in items)
+
+    def resolver_df(self, df, presupuesto=None):
+        """
+        Resuelve cada instancia (columnas pesos, valores, capacidad) y devuelve
+        un DataFrame con el valor, la heurística ganadora y los tiempos.
+        """
+        registros = []
+        for _, row in df.iterrows():
+            res = self.resolver(row["pesos"], row["valores"], row["capacidad"], presupuesto=presupuesto)
+            registros.append({
+                "valor_total": res["total_value"],
+                "peso_usado": res["total_peso_usado"],
+                "heuristica": res["heuristica"],
+                "optimo_certificado": res["optimo_certificado"],
+                "completadas": res["completadas"],
+                "canceladas": res["canceladas"],
+                "tiempo": res["solve_time"]
+            })
+        return pd.DataFrame(registros, index=df.index)
+
+
+def resolver_portafolio(weights, values, capacity, codigos=None, n_procesos=None, presupuesto=None):
+    """Atajo para una sola instancia: crea el pool, resuelve y lo cierra."""
+    with Portafolio(codigos, n_procesos=n_procesos) as portafolio:
+        return portafolio.resolver(weights, values, capacity, presupuesto=presupuesto)
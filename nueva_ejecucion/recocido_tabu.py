@@ -0,0 +1,299 @@
+# recocido_tabu.py
+import math
+import time
+import numpy as np
+
+
+# ============================================================
+# Recocido simulado y búsqueda tabú sobre una máscara de bits
+# La solución es un vector 0/1 con peso y valor mantenidos de
+# forma incremental, y una permutación 'lista' cuyos primeros k
+# elementos son los seleccionados (pos[i] = posición de i). Así
+# elegir al azar un seleccionado o un no seleccionado, meter o
+# sacar un ítem cuestan O(1).
+# Movimientos: voltear un ítem (meter si cabe / sacar) o
+# intercambiar uno que entra por uno que sale. Los números
+# aleatorios se generan por lotes con NumPy:
+#   - recocido: se recorre el lote secuencialmente (criterio de
+#     Metropolis, temperatura geométrica según el tiempo usado)
+#   - tabú: cada lote es un vecindario muestreado que se evalúa
+#     vectorizado; se aplica el mejor movimiento admisible (no
+#     tabú, o que mejora el mejor valor: criterio de aspiración)
+# ============================================================
+
+class RecocidoTabu:
+    """
+    Estado incremental de una solución 0/1 y los dos modos de búsqueda.
+    Se parte del greedy por densidad o de seleccion_inicial (reparada
+    quitando los ítems de menor densidad si no es factible).
+    """
+
+    def __init__(self, weights, values, capacity, seleccion_inicial=None, semilla=None):
+        self.weights = [float(w) for w in weights]
+        self.values = [float(v) for v in values]
+        self.original_weights = list(weights)
+        self.original_values = list(values)
+        self.capacity = capacity
+        self.n = len(self.weights)
+        self.rng = np.random.default_rng(semilla)
+        self.iteraciones = 0
+
+        densidades = [v / w if w > 0 else (float("inf") if v > 0 else 0.0)
+                      for w, v in zip(self.weights, self.values)]
+        if seleccion_inicial is None:
+            seleccion, usado = set(), 0.0
+            for i in sorted(range(self.n), key=lambda i: densidades[i], reverse=True):
+                if usado + self.weights[i] <= capacity:
+                    seleccion.add(i)
+                    usado += self.weights[i]
+        else:
+            seleccion = set(int(i) for i in seleccion_inicial)
+            usado = sum(self.weights[i] for i in seleccion)
+            for i in sorted(seleccion, key=lambda i: densidades[i]):
+                if usado <= capacity:
+                    break
+                seleccion.discard(i)
+                usado -= self.weights[i]
+
+        self.x = [0] * self.n
+        self.lista = sorted(seleccion) + [i for i in range(self.n) if i not in seleccion]
+        self.pos = [0] * self.n
+        for p, i in enumerate(self.lista):
+            self.pos[i] = p
+        self.k = len(seleccion)
+        for i in seleccion:
+            self.x[i] = 1
+        self.total_weight = sum(self.weights[i] for i in seleccion)
+        self.total_value = sum(self.values[i] for i in seleccion)
+        self._guardar_mejor()
+
+    # ------------------------------------------------------------
+    # Actualización incremental O(1)
+    # ------------------------------------------------------------
+    def _intercambiar_posiciones(self, p, q):
+        a, b = self.lista[p], self.lista[q]
+        self.lista[p], self.lista[q] = b, a
+        self.pos[a], self.pos[b] = q, p
+
+    def _entrar(self, i):
+        self._intercambiar_posiciones(self.pos[i], self.k)
+        self.k += 1
+        self.x[i] = 1
+        self.total_weight += self.weights[i]
+        self.total_value += self.values[i]
+
+    def _salir(self, i):
+        self.k -= 1
+        self._intercambiar_posiciones(self.pos[i], self.k)
+        self.x[i] = 0
+        self.total_weight -= self.weights[i]
+        self.total_value -= self.values[i]
+
+    def _guardar_mejor(self):
+        self.mejor_valor = self.total_value
+        self.mejor_seleccion = self.lista[:self.k]
+
+    # ------------------------------------------------------------
+    # Recocido simulado
+    # ------------------------------------------------------------
+    def recocido(self, deadline, temperatura_inicial=None, temperatura_final=None,
+                 prob_intercambio=0.5, tam_lote=4096, max_iter=None, reportar=None):
+        """
+        Recocido simulado hasta el deadline (time.time()) o max_iter
+        movimientos propuestos. La temperatura baja geométricamente de
+        temperatura_inicial a temperatura_final según la fracción de tiempo usada.
+        """
+        if self.n == 0:
+            return self
+        if temperatura_inicial is None:
+            temperatura_inicial = 0.1 * (sum(self.values) / self.n) + 1e-9
+        if temperatura_final is None:
+            temperatura_final = temperatura_inicial * 1e-3
+        inicio = time.time()
+        duracion = max(deadline - inicio, 1e-9)
+        w, v, x, lista, n, capacity = self.weights, self.values, self.x, self.lista, self.n, self.capacity
+
+        while max_iter is None or self.iteraciones < max_iter:
+            ahora = time.time()
+            if ahora >= deadline:
+                break
+            fraccion = (ahora - inicio) / duracion
+            temperatura = temperatura_inicial * (temperatura_final / temperatura_inicial) ** fraccion
+            mejoro = False
+
+            tipos = (self.rng.random(tam_lote) < prob_intercambio).tolist()
+            ra = self.rng.random(tam_lote).tolist()
+            rb = self.rng.random(tam_lote).tolist()
+            umbrales = self.rng.random(tam_lote).tolist()
+            for t in range(tam_lote):
+                k = self.k
+                if tipos[t] and 0 < k < n:
+                    entra = lista[k + int(ra[t] * (n - k))]
+                    sale = lista[int(rb[t] * k)]
+                    dw, dv = w[entra] - w[sale], v[entra] - v[sale]
+                else:
+                    i = int(ra[t] * n)
+                    if x[i]:
+                        entra, sale, dw, dv = -1, i, -w[i], -v[i]
+                    else:
+                        entra, sale, dw, dv = i, -1, w[i], v[i]
+                if self.total_weight + dw > capacity:
+                    continue
+                if dv < 0 and umbrales[t] >= math.exp(dv / temperatura):
+                    continue
+                if sale >= 0:
+                    self._salir(sale)
+                if entra >= 0:
+                    self._entrar(entra)
+                if self.total_value > self.mejor_valor:
+                    self._guardar_mejor()
+                    mejoro = True
+            self.iteraciones += tam_lote
+            if mejoro and reportar is not None:
+                reportar({"items": sorted(self.mejor_seleccion)})
+        return self
+
+    # ------------------------------------------------------------
+    # Búsqueda tabú
+    # ------------------------------------------------------------
+    def tabu(self, deadline, tenencia=None, tam_vecindario=64, prob_intercambio=0.5,
+             max_iter=None, reportar=None):
+        """
+        Búsqueda tabú hasta el deadline (time.time()) o max_iter iteraciones.
+        En cada iteración se muestrea un vecindario de tam_vecindario
+        movimientos y se aplica el mejor admisible, aunque empeore. Los ítems
+        movidos quedan tabú 'tenencia' iteraciones.
+        """
+        if self.n == 0:
+            return self
+        if tenencia is None:
+            tenencia = max(5, min(50, self.n // 10))
+        n = self.n
+        w = np.append(np.asarray(self.weights), 0.0)  # índice -1 = "ningún ítem"
+        v = np.append(np.asarray(self.values), 0.0)
+        tabu_hasta = np.zeros(n + 1, dtype=np.int64)
+        tabu_hasta[-1] = -1
+
+        # Copias NumPy de la permutación y la máscara para muestrear el
+        # vecindario; cada movimiento aceptado actualiza solo las dos
+        # posiciones que intercambia (O(1) por movimiento)
+        lista = np.asarray(self.lista)
+        x = np.asarray(self.x, dtype=bool)
+
+        def mover(i, entra):
+            p, q = self.pos[i], (self.k if entra else self.k - 1)
+            if entra:
+                self._entrar(i)
+            else:
+                self._salir(i)
+            lista[p], lista[q] = self.lista[p], self.lista[q]
+            x[i] = entra
+
+        while max_iter is None or self.iteraciones < max_iter:
+            if time.time() >= deadline:
+                break
+            self.iteraciones += 1
+            k = self.k
+
+            ra = self.rng.random(tam_vecindario)
+            rb = self.rng.random(tam_vecindario)
+            intercambio = (self.rng.random(tam_vecindario) < prob_intercambio) & (0 < k < n)
+            volteo = (ra * n).astype(np.int64)
+            seleccionado = x[volteo]
+            entra = np.where(seleccionado, -1, volteo)
+            sale = np.where(seleccionado, volteo, -1)
+            if 0 < k < n:
+                entra = np.where(intercambio, lista[k + (ra * (n - k)).astype(np.int64)], entra)
+                sale = np.where(intercambio, lista[(rb * k).astype(np.int64)], sale)
+
+            dw = w[entra] - w[sale]
+            dv = v[entra] - v[sale]
+            factible = self.total_weight + dw <= self.capacity
+            es_tabu = (tabu_hasta[entra] > self.iteraciones) | (tabu_hasta[sale] > self.iteraciones)
+            aspiracion = self.total_value + dv > self.mejor_valor
+            admisible = factible & (~es_tabu | aspiracion)
+            if not admisible.any():
+                continue
+
+            m = int(np.argmax(np.where(admisible, dv, -np.inf)))
+            if sale[m] >= 0:
+                mover(int(sale[m]), False)
+                tabu_hasta[sale[m]] = self.iteraciones + tenencia
+            if entra[m] >= 0:
+                mover(int(entra[m]), True)
+                tabu_hasta[entra[m]] = self.iteraciones + tenencia
+            if self.total_value > self.mejor_valor:
+                self._guardar_mejor()
+                if reportar is not None:
+                    reportar({"items": sorted(self.mejor_seleccion)})
+        return self
+
+    def resultado(self):
+        items = sorted(self.mejor_seleccion)
+        return {
+            "items": items,
+            "total_value": sum(self.original_values[i] for i in items),
+            "total_peso_usado": sum(self.original_weights[i] for i in items),
+            "solve_time": 0.0,
+            "iteraciones": self.iteraciones
+        }
+
+
+def recocido_tabu(weights, values, capacity, modo="recocido", tiempo_limite=1.0, deadline=None,
+                  seleccion_inicial=None, semilla=None, reportar=None, **parametros):
+    """
+    Ejecuta el modo "recocido" o "tabu" durante tiempo_limite segundos (o
+    hasta el deadline absoluto, si es anterior). Los parámetros adicionales
+    se pasan al método del modo. Devuelve un diccionario con el formato de
+    KnapsackSkeleton.solve() más "iteraciones" y "modo".
+    """
+    start_time = time.time()
+    limite = start_time + tiempo_limite
+    deadline = limite if deadline is None else min(deadline, limite)
+    motor = RecocidoTabu(weights, values, capacity, seleccion_inicial=seleccion_inicial, semilla=semilla)
+    if modo == "recocido":
+        motor.recocido(deadline, reportar=reportar, **parametros)
+    elif modo == "tabu":
+        motor.tabu(deadline, reportar=reportar, **parametros)
+    else:
+        raise ValueError(f"Modo desconocido: {modo}. Use 'recocido' o 'tabu'.")
+    resultado = motor.resultado()
+    resultado["modo"] = modo
+    resultado["solve_time"] = time.time() - start_time
+    return resultado
+
+
+def heuristic(items_state):
+    """
+    Adaptador con la firma de KnapsackSkeleton.heuristic. Lee de items_state
+    (si existen) "modo_metaheuristica", "tiempo_limite", "deadline" y
+    "solucion_inicial" (arranque en caliente).
+    """
+    return recocido_tabu(items_state["weights"], items_state["values"], items_state["capacity"],
+                         modo=items_state.get("modo_metaheuristica", "recocido"),
+                         tiempo_limite=items_state.get("tiempo_limite", 1.0),
+                         deadline=items_state.get("deadline"),
+                         seleccion_inicial=items_state.get("solucion_inicial"),
+                         reportar=items_state.get("reportar"))
+
+
+def post_optimizar(heuristic_base, modo="tabu", tiempo_limite=1.0):
+    """
+    Envuelve una heurística heuristic(items_state) (por ejemplo una generada
+    por FunSearch) para que su solución se use como punto de partida del
+    recocido o la búsqueda tabú (el motor conserva siempre el mejor valor
+    visto, así que nunca empeora la solución base factible). El resultado
+    puede asignarse a KnapsackSkeleton.heuristic.
+    """
+    def heuristic_post_optimizada(items_state):
+        start_time = time.time()
+        base = heuristic_base(dict(items_state))
+        resultado = recocido_tabu(items_state["weights"], items_state["values"], items_state["capacity"],
+                                  modo=modo, tiempo_limite=tiempo_limite,
+                                  deadline=items_state.get("deadline"),
+                                  seleccion_inicial=base.get("items", []),
+                                  reportar=items_state.get("reportar"))
+        resultado["solve_time"] = time.time() - start_time
+        return resultado
+
+    return heuristic_post_optimizada
@@ -0,0 +1,149 @@
+# reduccion_items.py
+import time
+import numpy as np
+
+
+# ============================================================
+# Reducción de instancias antes de resolver
+#   1. Ítems idénticos (mismo peso y valor) se agrupan en un tipo
+#      con multiplicidad.
+#   2. Dominancia: el tipo i domina al tipo j si w_i <= w_j y
+#      v_i >= v_j (y no son idénticos). Existe un óptimo en el que,
+#      si se usa una copia de j, se usan todas las copias de los
+#      tipos que lo dominan. Por eso j se elimina si el peso de sus
+#      dominantes más w_j supera la capacidad, y sus copias útiles
+#      se limitan a (C - peso_dominantes) // w_j.
+#   3. Cada multiplicidad se divide en piezas 1, 2, 4, ..., resto
+#      (mochila acotada -> 0/1), de modo que k copias pasan a ser
+#      O(log k) pseudo-ítems.
+# Cualquier solver o heurística trabaja sobre la instancia
+# reducida y InstanciaReducida.mapear() traduce la solución a los
+# índices originales.
+# ============================================================
+
+# Tamaño de bloque para comparar tipos de a pares sin usar demasiada memoria
+BLOQUE_DOMINANCIA = 2048
+
+
+class InstanciaReducida:
+    """
+    Instancia reducida lista para cualquier solver.
+        - weights, values, capacity: datos de la instancia reducida
+        - grupos: índices originales que representa cada pseudo-ítem
+        - fijos: índices originales que siempre entran (peso 0, valor > 0)
+        - estadisticas: conteos de la reducción
+    """
+
+    def __init__(self, weights, values, capacity):
+        start_time = time.time()
+        pesos = np.asarray(weights, dtype=float)
+        valores = np.asarray(values, dtype=float)
+        self.original_weights = list(weights)
+        self.original_values = list(values)
+        self.capacity = capacity
+
+        self.fijos = [int(i) for i in np.flatnonzero((pesos == 0) & (valores > 0))]
+        utiles = np.flatnonzero((pesos > 0) & (pesos <= capacity) & (valores > 0))
+
+        # 1. Agrupar ítems idénticos
+        pares = np.stack((pesos[utiles], valores[utiles]), axis=1) if len(utiles) else np.zeros((0, 2))
+        tipos, inverso, conteos = np.unique(pares, axis=0, return_inverse=True, return_counts=True)
+        inverso = np.asarray(inverso).reshape(-1)
+        orden = np.argsort(inverso, kind="stable")
+        inicios = np.concatenate(([0], np.cumsum(conteos)))
+        indices_tipo = [utiles[orden[inicios[t]:inicios[t + 1]]] for t in range(len(tipos))]
+
+        # 2. Dominancia entre tipos
+        tw, tv = tipos[:, 0], tipos[:, 1]
+        peso_dominantes = np.zeros(len(tipos))
+        for a in range(0, len(tipos), BLOQUE_DOMINANCIA):
+            b = min(a + BLOQUE_DOMINANCIA, len(tipos))
+            domina = (tw[None, :] <= tw[a:b, None]) & (tv[None, :] >= tv[a:b, None])
+            domina[np.arange(b - a), np.arange(a, b)] = False  # un tipo no se domina a sí mismo
+            peso_dominantes[a:b] = domina.astype(float) @ (tw * conteos)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            copias_utiles = np.floor((capacity - peso_dominantes) / tw)
+        copias = np.clip(np.minimum(conteos, copias_utiles), 0, None).astype(np.int64)
+
+        # 3. Descomposición binaria de multiplicidades
+        self.weights, self.values, self.grupos = [], [], []
+        for t in range(len(tipos)):
+            k, inicio = 1, 0
+            while inicio < copias[t]:
+                k = min(k, copias[t] - inicio)
+                self.weights.append(tw[t] * k)
+                self.values.append(tv[t] * k)
+                self.grupos.append([int(i) for i in indices_tipo[t][inicio:inicio + k]])
+                inicio += k
+                k *= 2
+        if all(float(x).is_integer() for x in self.original_weights):
+            self.weights = [int(x) for x in self.weights]
+        if all(float(x).is_integer() for x in self.original_values):
+            self.values = [int(x) for x in self.values]
+
+        self.estadisticas = {
+            "items_originales": len(pesos),
+            "tipos_distintos": len(tipos),
+            "tipos_dominados": int(np.sum(copias == 0)),
+            "copias_eliminadas": int(conteos.sum() - copias.sum()) if len(tipos) else 0,
+            "items_reducidos": len(self.weights),
+            "tiempo_reduccion": time.time() - start_time,
+        }
+
+    def mapear(self, resultado):
+        """
+        Traduce un resultado sobre la instancia reducida (formato de
+        KnapsackSkeleton.solve()) a los índices de la instancia original.
+        """
+        items = list(self.fijos)
+        for k in resultado.get("items", []):
+            items.extend(self.grupos[k])
+        items.sort()
+        mapeado = dict(resultado)
+        mapeado["items"] = items
+        mapeado["total_value"] = sum(self.original_values[i] for i in items)
+        mapeado["total_peso_usado"] = sum(self.original_weights[i] for i in items)
+        mapeado["reduccion"] = self.estadisticas
+        return mapeado
+
+    def items_state(self):
+        """Estado de ítems reducido con el formato que recibe heuristic()."""
+        return {
+            "weights": list(self.weights),
+            "values": list(self.values),
+            "capacity": float(self.capacity)
+        }
+
+
+def resolver_reducido(solver, weights, values, capacity):
+    """
+    Reduce la instancia, la resuelve con solver(weights, values, capacity)
+    (por ejemplo dp_capacidad o resolver_exacto) y devuelve la solución
+    sobre los índices originales.
+    """
+    start_time = time.time()
+    reducida = InstanciaReducida(weights, values, capacity)
+    resultado = reducida.mapear(solver(reducida.weights, reducida.values, reducida.capacity))
+    resultado["solve_time"] = time.time() - start_time
+    return resultado
+
+
+def heuristica_reducida(heuristic):
+    """
+    Envuelve una heurística heuristic(items_state) para que trabaje sobre la
+    instancia reducida. El resultado puede asignarse a KnapsackSkeleton.heuristic.
+    """
+    def heuristic_con_reduccion(items_state):
+        reducida = InstanciaReducida(items_state["weights"], items_state["values"], items_state["capacity"])
+        estado = dict(items_state)
+        estado.update(reducida.items_state())
+        if "reportar" in items_state:
+            # Las soluciones parciales se reportan ya traducidas a índices originales
+            def reportar(parcial):
+                if any(not 0 <= k < len(reducida.grupos) for k in parcial.get("items", [])):
+                    return False
+                return items_state["reportar"](reducida.mapear(parcial))
+            estado["reportar"] = reportar
+        return reducida.mapear(heuristic(estado))
+
+    return heuristic_con_reduccion
@@ -0,0 +1,119 @@
+# refinamiento_exacto.py
+import time
+import numpy as np
+
+from dp_mochila import dp_capacidad
+
+
+# ============================================================
+# Refinamiento exacto de una solución heurística
+# Tras las fases greedy y de intercambios suele quedar holgura
+# que un subproblema exacto pequeño puede aprovechar:
+#   1. Se ordenan los ítems por densidad y se ubica el ítem
+#      crítico s del greedy.
+#   2. Se libera una ventana de ítems marginales alrededor de s
+#      (seleccionados o no en la solución heurística); el resto
+#      de la solución queda fijo.
+#   3. La ventana se resuelve exacto con dp_capacidad sobre la
+#      capacidad residual (acotada por el peso de la ventana).
+# La selección previa de la ventana es factible en el
+# subproblema, así que el resultado nunca empeora. El costo de la
+# DP (celdas = ítems × capacidad) se limita con max_celdas: si la
+# ventana lo excede se achica hasta cumplirlo.
+# ============================================================
+
+# Ítems de la ventana y celdas máximas de la DP por defecto
+VENTANA_REFINAMIENTO = 128
+MAX_CELDAS_REFINAMIENTO = 4_000_000
+
+
+def _ventana_critica(pesos, valores, capacidad, tamano):
+    """Índices de los 'tamano' candidatos más cercanos al ítem crítico en orden de densidad."""
+    candidatos = np.flatnonzero((pesos > 0) & (pesos <= capacidad) & (valores > 0))
+    orden = candidatos[np.argsort(-(valores[candidatos] / pesos[candidatos]), kind="stable")]
+    peso_pref = np.cumsum(pesos[orden])
+    s = min(int(np.searchsorted(peso_pref, capacidad, side="right")), len(orden))
+    inicio = max(0, min(s - tamano // 2, len(orden) - tamano))
+    return orden[inicio:inicio + tamano]
+
+
+def refinar_solucion(weights, values, capacity, resultado, ventana=VENTANA_REFINAMIENTO,
+                     max_celdas=MAX_CELDAS_REFINAMIENTO):
+    """
+    Mejora la solución 'resultado' (diccionario con "items", como el de
+    KnapsackSkeleton.solve()) resolviendo exacto una ventana de ítems
+    alrededor del ítem crítico. Requiere pesos enteros; con pesos no
+    enteros, o si la solución no es válida o factible, la devuelve sin
+    cambios. Devuelve una copia del resultado con "items", "total_value" y
+    "total_peso_usado" actualizados más "ganancia_refinamiento",
+    "ventana_refinamiento" y "tiempo_refinamiento".
+    """
+    start_time = time.time()
+    refinado = dict(resultado)
+    pesos = np.asarray(weights)
+    valores = np.asarray(values)
+    n = len(pesos)
+    try:
+        items = sorted(set(int(i) for i in resultado.get("items", [])))
+    except (TypeError, ValueError):
+        items = None
+    valida = items is not None and all(0 <= i < n for i in items)
+    enteros = not n or bool(np.all(pesos == np.floor(pesos)))
+    if not valida or not enteros or sum(weights[i] for i in items) > capacity:
+        refinado.update(ganancia_refinamiento=0, ventana_refinamiento=0,
+                        tiempo_refinamiento=time.time() - start_time)
+        return refinado
+
+    capacidad = int(np.floor(capacity))
+    seleccion = np.zeros(n, dtype=bool)
+    seleccion[items] = True
+    # Los ítems de peso 0 y valor positivo entran siempre; los de valor <= 0 sobran
+    seleccion |= (pesos == 0) & (valores > 0)
+    seleccion &= valores > 0
+
+    # Ventana alrededor del ítem crítico, achicada hasta respetar max_celdas
+    libres = np.zeros(0, dtype=np.int64)
+    tamano = ventana
+    while tamano > 0:
+        ventana_actual = _ventana_critica(pesos, valores, capacidad, tamano)
+        fijos = seleccion.copy()
+        fijos[ventana_actual] = False
+        tope = min(capacidad - int(pesos[fijos].sum()), int(pesos[ventana_actual].sum()))
+        celdas = len(ventana_actual) * (tope + 1)
+        if celdas <= max_celdas:
+            libres = ventana_actual
+            break
+        tamano = min(tamano - 1, int(tamano * max_celdas / celdas))
+
+    if len(libres):
+        sub = dp_capacidad(pesos[libres], valores[libres], tope)
+        if sub["total_value"] > valores[libres][seleccion[libres]].sum():
+            seleccion = fijos
+            seleccion[libres[sub["items"]]] = True
+
+    valor_previo = sum(values[i] for i in items)
+    items = [int(i) for i in np.flatnonzero(seleccion)]
+    refinado["items"] = items
+    refinado["total_value"] = sum(values[i] for i in items)
+    refinado["total_peso_usado"] = sum(weights[i] for i in items)
+    refinado["ganancia_refinamiento"] = refinado["total_value"] - valor_previo
+    refinado["ventana_refinamiento"] = len(libres)
+    refinado["tiempo_refinamiento"] = time.time() - start_time
+    return refinado
+
+
+def heuristica_refinada(heuristic, ventana=VENTANA_REFINAMIENTO, max_celdas=MAX_CELDAS_REFINAMIENTO):
+    """
+    Envuelve una heurística heuristic(items_state) para que su solución pase
+    por refinar_solucion. El resultado puede asignarse a
+    KnapsackSkeleton.heuristic.
+    """
+    def heuristic_con_refinamiento(items_state):
+        start_time = time.time()
+        base = heuristic(dict(items_state))
+        resultado = refinar_solucion(items_state["weights"], items_state["values"], items_state["capacity"],
+                                     base, ventana=ventana, max_celdas=max_celdas)
+        resultado["solve_time"] = time.time() - start_time
+        return resultado
+
+    return heuristic_con_refinamiento
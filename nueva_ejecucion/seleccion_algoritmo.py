@@ -0,0 +1,220 @@
+# seleccion_algoritmo.py
+import glob
+import os
+import pickle
+import re
+import time
+
+import numpy as np
+import pandas as pd
+
+from cotas_mochila import matrices_ordenadas
+from portafolio import CARPETA_HEURISTICAS, _compilar
+
+
+# ============================================================
+# Selección de algoritmo por instancia
+# En lugar de correr todo el portafolio, se predice la mejor
+# heurística a partir de características baratas de la instancia:
+#   - n_items, razón capacidad / suma de pesos
+#   - correlación peso–valor, dispersión de densidades (CV)
+#   - razón de ítems duplicados (mismo peso y valor)
+# Las características se calculan vectorizadas sobre todas las
+# instancias a la vez con las matrices de cotas_mochila.
+# El selector es un k vecinos más cercanos sobre características
+# estandarizadas, entrenado con los resultados por instancia que
+# FunSearch guardó en salida_heuristicas/resultados_iteracion_*.csv
+# (etiqueta = heurística de mayor valor en cada instancia).
+# ============================================================
+
+CARACTERISTICAS = ["n_items", "razon_capacidad", "correlacion_peso_valor",
+                   "dispersion_densidad", "razon_duplicados"]
+
+RUTA_SELECTOR = "selector_algoritmo.pkl"
+
+
+def _matriz_caracteristicas(lista_pesos, lista_valores, capacidades):
+    pesos, valores, orden, n_items = matrices_ordenadas(lista_pesos, lista_valores)
+    capacidades = np.asarray(capacidades, dtype=float)
+    valido = orden >= 0
+    n = np.maximum(n_items, 1).astype(float)
+
+    suma_pesos = pesos.sum(axis=1)
+    razon_capacidad = np.where(suma_pesos > 0, capacidades / np.where(suma_pesos > 0, suma_pesos, 1), 1.0)
+
+    # Correlación de Pearson sobre los ítems reales de cada fila
+    media_w = pesos.sum(axis=1) / n
+    media_v = valores.sum(axis=1) / n
+    dw = np.where(valido, pesos - media_w[:, None], 0.0)
+    dv = np.where(valido, valores - media_v[:, None], 0.0)
+    denominador = np.sqrt((dw ** 2).sum(axis=1) * (dv ** 2).sum(axis=1))
+    correlacion = np.where(denominador > 0, (dw * dv).sum(axis=1) / np.where(denominador > 0, denominador, 1), 0.0)
+
+    # Coeficiente de variación de las densidades (ítems de peso positivo)
+    con_peso = valido & (pesos > 0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        densidad = np.where(con_peso, valores / np.where(con_peso, pesos, 1), 0.0)
+    cuenta = np.maximum(con_peso.sum(axis=1), 1)
+    media_d = densidad.sum(axis=1) / cuenta
+    var_d = (np.where(con_peso, densidad - media_d[:, None], 0.0) ** 2).sum(axis=1) / cuenta
+    dispersion = np.where(media_d > 0, np.sqrt(var_d) / np.where(media_d > 0, media_d, 1), 0.0)
+
+    # Duplicados: pares (peso, valor) iguales quedan contiguos al ordenar la fila
+    pares = np.where(valido, pesos * (valores.max(initial=0.0) + 1.0) + valores, np.nan)
+    pares = np.sort(pares, axis=1)
+    duplicados = (pares[:, 1:] == pares[:, :-1]).sum(axis=1) if pares.shape[1] > 1 else np.zeros(len(n))
+
+    return np.column_stack((n_items.astype(float), razon_capacidad, correlacion, dispersion, duplicados / n))
+
+
+def extraer_caracteristicas(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Características de cada instancia del DataFrame (columnas pesos, valores,
+    capacidad), calculadas en una sola pasada vectorizada.
+    """
+    matriz = _matriz_caracteristicas(df["pesos"].tolist(), df["valores"].tolist(), df["capacidad"].to_numpy())
+    return pd.DataFrame(matriz, columns=CARACTERISTICAS, index=df.index)
+
+
+def caracteristicas_instancia(weights, values, capacity):
+    """Atajo para una sola instancia: vector de características."""
+    return _matriz_caracteristicas([list(weights)], [list(values)], [capacity])[0]
+
+
+class SelectorAlgoritmo:
+    """
+    Clasificador k vecinos más cercanos (distancia euclídea sobre
+    características estandarizadas, voto ponderado por 1/distancia).
+    Guarda el código de las heurísticas que puede elegir, de modo que el
+    pickle basta para despachar instancias.
+    """
+
+    def __init__(self, k=5):
+        self.k = k
+        self.media = None
+        self.escala = None
+        self.X = None
+        self.etiquetas = None
+        self.nombres = []
+        self.codigos = {}
+        self._compiladas = {}
+
+    def entrenar(self, X, etiquetas, codigos=None):
+        X = np.asarray(X, dtype=float)
+        self.media = X.mean(axis=0)
+        self.escala = np.where(X.std(axis=0) > 0, X.std(axis=0), 1.0)
+        self.nombres = sorted(set(etiquetas))
+        posicion = {nombre: j for j, nombre in enumerate(self.nombres)}
+        self.etiquetas = np.array([posicion[e] for e in etiquetas], dtype=np.int64)
+        self.X = (X - self.media) / self.escala
+        if codigos is not None:
+            self.codigos = {nombre: codigos[nombre] for nombre in self.nombres}
+        return self
+
+    def predecir(self, X):
+        """Nombre de la heurística elegida para cada fila de X."""
+        Z = (np.atleast_2d(np.asarray(X, dtype=float)) - self.media) / self.escala
+        distancias = np.sqrt(((Z[:, None, :] - self.X[None, :, :]) ** 2).sum(axis=2))
+        k = min(self.k, len(self.X))
+        vecinos = np.argpartition(distancias, k - 1, axis=1)[:, :k]
+        pesos = 1.0 / (np.take_along_axis(distancias, vecinos, axis=1) + 1e-9)
+        votos = np.zeros((len(Z), len(self.nombres)))
+        np.add.at(votos, (np.repeat(np.arange(len(Z)), k), self.etiquetas[vecinos].ravel()), pesos.ravel())
+        return [self.nombres[j] for j in np.argmax(votos, axis=1)]
+
+    def seleccionar(self, weights, values, capacity):
+        return self.predecir(caracteristicas_instancia(weights, values, capacity))[0]
+
+    def heuristic(self, items_state):
+        """
+        Adaptador con la firma de KnapsackSkeleton.heuristic: elige la
+        heurística para la instancia y le delega items_state.
+        """
+        start_time = time.time()
+        nombre = self.seleccionar(items_state["weights"], items_state["values"], items_state["capacity"])
+        if nombre not in self._compiladas:
+            self._compiladas[nombre] = _compilar(nombre, self.codigos[nombre])
+        resultado = self._compiladas[nombre](items_state)
+        resultado["heuristica"] = nombre
+        resultado["solve_time"] = time.time() - start_time
+        return resultado
+
+    def guardar(self, ruta=RUTA_SELECTOR):
+        with open(ruta, "wb") as f:
+            pickle.dump(self, f)
+        print(f"💾 Selector guardado en: {ruta}")
+
+    @staticmethod
+    def cargar(ruta=RUTA_SELECTOR):
+        with open(ruta, "rb") as f:
+            return pickle.load(f)
+
+    def __getstate__(self):
+        estado = dict(self.__dict__)
+        estado["_compiladas"] = {}
+        return estado
+
+
+def cargar_resultados_heuristicas(carpeta=CARPETA_HEURISTICAS, n_instancias=None):
+    """
+    Lee los resultados_iteracion_*.csv que tienen su heuristica_iter*.py.
+    Devuelve (valores, tiempos, codigos): DataFrames instancias × heurísticas
+    y {nombre: código}. Se omiten los CSV con otra cantidad de instancias.
+    """
+    valores, tiempos, codigos = {}, {}, {}
+    for ruta_csv in glob.glob(os.path.join(carpeta, "resultados_iteracion_*.csv")):
+        iteracion = re.search(r"resultados_iteracion_(\d+)\.csv$", ruta_csv).group(1)
+        ruta_codigo = os.path.join(carpeta, f"heuristica_iter{iteracion}.py")
+        if not os.path.exists(ruta_codigo):
+            continue
+        df = pd.read_csv(ruta_csv)
+        if n_instancias is not None and len(df) != n_instancias:
+            continue
+        nombre = f"heuristica_iter{iteracion}"
+        valores[nombre] = df["valor_total"].to_numpy(dtype=float)
+        tiempos[nombre] = df["tiempo"].to_numpy(dtype=float)
+        with open(ruta_codigo, encoding="utf-8") as f:
+            codigos[nombre] = f.read()
+    orden = sorted(valores, key=lambda nombre: int(nombre[len("heuristica_iter"):]))
+    return (pd.DataFrame({n: valores[n] for n in orden}), pd.DataFrame({n: tiempos[n] for n in orden}),
+            codigos)
+
+
+def etiquetar_instancias(valores, tiempos):
+    """
+    Mejor heurística por instancia: la de mayor valor. Los empates (muy
+    frecuentes) se rompen a favor de la que gana en más instancias y luego
+    de la de menor tiempo medio, para concentrar las etiquetas.
+    """
+    V = valores.to_numpy()
+    ganadoras = V >= V.max(axis=1, keepdims=True) - 1e-9
+    victorias = ganadoras.sum(axis=0)
+    tiempo_medio = tiempos.mean(axis=0).to_numpy()
+    preferencia = np.lexsort((tiempo_medio, -victorias))  # mejor primero
+    rango = np.empty(len(preferencia), dtype=np.int64)
+    rango[preferencia] = np.arange(len(preferencia))
+    elegida = np.argmin(np.where(ganadoras, rango[None, :], len(rango)), axis=1)
+    return [valores.columns[j] for j in elegida]
+
+
+def entrenar_selector(ruta_base=os.path.join("salida_muestras", "lotes_100_df.pkl"),
+                      carpeta=CARPETA_HEURISTICAS, k=5, ruta_salida=RUTA_SELECTOR):
+    """
+    Entrena el selector con las instancias de ruta_base (las mismas que
+    evaluó funsearch_loop) y los CSV por instancia de cada heurística, y lo
+    guarda con pickle en ruta_salida (si no es None).
+    """
+    df = pd.read_pickle(ruta_base)
+    valores, tiempos, codigos = cargar_resultados_heuristicas(carpeta, n_instancias=len(df))
+    if valores.empty:
+        raise ValueError(f"No hay resultados por instancia en {carpeta} para {len(df)} instancias.")
+    etiquetas = etiquetar_instancias(valores, tiempos)
+    selector = SelectorAlgoritmo(k=k).entrenar(extraer_caracteristicas(df).to_numpy(), etiquetas, codigos)
+    if ruta_salida is not None:
+        selector.guardar(ruta_salida)
+    return selector
+
+
+if __name__ == "__main__":
+    selector = entrenar_selector()
+    print(f"📊 Heurísticas elegibles: {', '.join(selector.nombres)}")
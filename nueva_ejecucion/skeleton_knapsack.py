@@ -1,5 +1,10 @@
 # skeleton_knapsack.py
+import inspect
 import time
+from bisect import bisect_left
+
+from fijacion_variables import fijar_variables as calcular_fijacion
+from refinamiento_exacto import refinar_solucion
 
 class KnapsackSkeleton:
     """
@@ -24,30 +29,91 @@ class KnapsackSkeleton:
             - "weights": lista de pesos
             - "values": lista de valores
             - "capacity": capacidad total (float o int)
+            - "reportar": función reportar(resultado) para entregar la mejor
+              solución encontrada hasta el momento (protocolo anytime)
+            - "deadline" / "presupuesto": instante límite (time.time()) y
+              segundos disponibles, solo si solve() recibe un presupuesto
+            - "solucion_inicial": índices de una solución previa (quizá no
+              factible), solo si solve() recibe solucion_previa
+            - "items_modificados": ítems nuevos o modificados desde esa solución
         Debe devolver un diccionario con:
             - "items": índices seleccionados
             - "total_value": valor total obtenido
             - "total_peso_usado": peso total
             - "solve_time": tiempo de ejecución
+        También puede ser un generador que entregue (yield) diccionarios con ese
+        formato a medida que mejora la solución; solve() se queda con el mejor.
         """
         raise NotImplementedError("Debe implementarse la función 'heuristic' en la subclase o módulo generado.")
 
-    def solve(self):
+    def solve(self, fijar_variables=False, presupuesto=None, solucion_previa=None, cambios=None,
+              refinar=False):
         """
         Ejecuta la heurística definida por el usuario o generada por FunSearch.
         Incluye protección contra errores de tipo y modificaciones indebidas.
+
+        Con fijar_variables=True se fijan antes las variables que las cotas
+        de costo reducido permiten decidir (ver fijacion_variables.py) y la
+        heurística recibe solo los ítems no fijados con la capacidad residual.
+
+        Con presupuesto (segundos) la heurística recibe "deadline" y
+        "presupuesto" en items_state. Si la heurística falla, o si es un
+        generador y se agota el presupuesto, se devuelve la mejor solución
+        factible que haya reportado en lugar de una solución vacía.
+
+        Arranque en caliente: solucion_previa es la máscara 0/1 (o el
+        resultado de un solve() anterior) de la instancia previa y cambios
+        describe cómo se pasó a la actual (ver _trasladar_solucion). La
+        heurística la recibe en items_state["solucion_inicial"] y debe
+        repararla si ya no es factible.
+
+        Con refinar=True la solución final pasa por la etapa exacta de
+        refinar_solucion (ver refinamiento_exacto.py): una ventana de ítems
+        alrededor del ítem crítico se resuelve con DP sobre la capacidad
+        residual, con un costo acotado.
         """
         start_time = time.time()
 
         # 🔒 Crear una copia segura del estado de los ítems
-        items_state = {
-            "weights": list(self.weights),
-            "values": list(self.values),
-            "capacity": float(self.capacity)
-        }
+        fijacion = None
+        if fijar_variables:
+            fijacion = calcular_fijacion(self.weights, self.values, self.capacity)
+            items_state = {
+                "weights": [self.weights[i] for i in fijacion["libres"]],
+                "values": [self.values[i] for i in fijacion["libres"]],
+                "capacity": float(fijacion["capacidad_residual"])
+            }
+        else:
+            items_state = {
+                "weights": list(self.weights),
+                "values": list(self.values),
+                "capacity": float(self.capacity)
+            }
+
+        # 🔥 Arranque en caliente desde una solución previa
+        if solucion_previa is not None:
+            inicial, modificados = self._trasladar_solucion(solucion_previa, cambios)
+            if fijacion is not None:
+                posicion_libre = {i: k for k, i in enumerate(fijacion["libres"])}
+                inicial = [posicion_libre[i] for i in inicial if i in posicion_libre]
+                modificados = [posicion_libre[i] for i in modificados if i in posicion_libre]
+            items_state["solucion_inicial"] = inicial
+            items_state["items_modificados"] = modificados
+
+        # ⏱️ Protocolo anytime: callback de incumbente y deadline opcional
+        self.mejor_parcial = None
+        items_state["reportar"] = self._crear_reportar(
+            list(items_state["weights"]), list(items_state["values"]), items_state["capacity"])
+        deadline = None
+        if presupuesto is not None:
+            deadline = start_time + presupuesto
+            items_state["presupuesto"] = presupuesto
+            items_state["deadline"] = deadline
 
         try:
             resultado = self.heuristic(items_state)
+            if inspect.isgenerator(resultado):
+                resultado = self._consumir_generador(resultado, items_state["reportar"], deadline)
 
             # Validación del tipo de salida
             if not isinstance(resultado, dict):
@@ -55,20 +121,32 @@ class KnapsackSkeleton:
 
         except Exception as e:
             print(f"❌ Error al evaluar heurística: {e}")
-            return {
-                "items": [],
-                "total_value": 0,
-                "total_peso_usado": 0,
-                "solve_time": time.time() - start_time,
-                "error": str(e)
-            }
-
-        end_time = time.time()
+            if self.mejor_parcial is None:
+                return {
+                    "items": [],
+                    "total_value": 0,
+                    "total_peso_usado": 0,
+                    "solve_time": time.time() - start_time,
+                    "error": str(e)
+                }
+            # Se conserva la mejor solución reportada antes del error
+            resultado = dict(self.mejor_parcial)
+            resultado["error"] = str(e)
+            resultado["incumbente_parcial"] = True
 
         # Asegurar que la salida tenga las claves esperadas
         resultado.setdefault("items", [])
         resultado.setdefault("total_value", 0)
         resultado.setdefault("total_peso_usado", 0)
+
+        if fijacion is not None:
+            resultado = self._deshacer_fijacion(resultado, fijacion)
+
+        # 🎯 Etapa final exacta sobre la ventana del ítem crítico
+        if refinar:
+            resultado = refinar_solucion(self.weights, self.values, self.capacity, resultado)
+
+        end_time = time.time()
         resultado["solve_time"] = end_time - start_time
 
         # Guardar resultados internos
@@ -78,6 +156,111 @@ class KnapsackSkeleton:
 
         return resultado
 
+    def _trasladar_solucion(self, solucion_previa, cambios=None):
+        """
+        Traduce una solución de la instancia previa a índices de la actual.
+        cambios (opcional) es un diccionario con:
+            - "mapa": {índice previo: índice actual}; los ausentes se eliminaron
+            - o bien "eliminados": índices previos eliminados; los demás
+              conservan su orden y los ítems nuevos van al final
+            - "agregados" / "modificados": índices actuales de ítems nuevos o
+              con peso/valor cambiado (con una máscara y "eliminados", los
+              agregados se deducen de su largo)
+        Los cambios de capacidad no necesitan describirse: la heurística
+        repara la solución. Devuelve (índices de la solución, ítems modificados).
+        """
+        if isinstance(solucion_previa, dict):
+            previos = list(solucion_previa.get("items", []))
+        else:
+            previos = [i for i, bit in enumerate(solucion_previa) if bit]
+        cambios = cambios or {}
+
+        n = len(self.weights)
+        modificados = set(cambios.get("agregados", [])) | set(cambios.get("modificados", []))
+        if "mapa" in cambios:
+            actuales = [cambios["mapa"][i] for i in previos if i in cambios["mapa"]]
+            if "agregados" not in cambios:
+                modificados |= set(range(n)) - set(cambios["mapa"].values())
+        else:
+            eliminados = sorted(set(cambios.get("eliminados", [])))
+            borrado = set(eliminados)
+            actuales = [i - bisect_left(eliminados, i) for i in previos if i not in borrado]
+            if "agregados" not in cambios and not isinstance(solucion_previa, dict):
+                modificados |= set(range(len(solucion_previa) - len(eliminados), n))
+        return (sorted(set(int(i) for i in actuales if 0 <= i < n)),
+                sorted(int(i) for i in modificados if 0 <= i < n))
+
+    def mascara_solucion(self):
+        """Máscara 0/1 de la última solución, lista para un arranque en caliente."""
+        seleccion = set(self.solution_items)
+        return [1 if i in seleccion else 0 for i in range(len(self.weights))]
+
+    def _crear_reportar(self, pesos, valores, capacidad):
+        """
+        Crea el callback reportar(resultado) que recibe la heurística. Valida
+        cada solución sobre la copia de los datos (índices válidos, sin
+        repetir, factible) y guarda en self.mejor_parcial la de mayor valor.
+        """
+        def reportar(parcial):
+            try:
+                items = sorted(set(int(i) for i in parcial.get("items", [])))
+            except (AttributeError, TypeError, ValueError):
+                return False
+            if any(i < 0 or i >= len(pesos) for i in items):
+                return False
+            peso = sum(pesos[i] for i in items)
+            if peso > capacidad:
+                return False
+            valor = sum(valores[i] for i in items)
+            if self.mejor_parcial is not None and valor <= self.mejor_parcial["total_value"]:
+                return False
+            self.mejor_parcial = {"items": items, "total_value": valor, "total_peso_usado": peso}
+            return True
+
+        return reportar
+
+    def _consumir_generador(self, generador, reportar, deadline):
+        """
+        Recorre una heurística generadora: cada solución entregada se reporta
+        como incumbente (también el valor del return final) y, si pasa el
+        deadline, el generador se cierra.
+        """
+        try:
+            while True:
+                try:
+                    reportar(next(generador))
+                except StopIteration as fin:
+                    if isinstance(fin.value, dict):
+                        reportar(fin.value)
+                    break
+                if deadline is not None and time.time() >= deadline:
+                    break
+        finally:
+            generador.close()
+        if self.mejor_parcial is None:
+            raise ValueError("La heurística generadora no entregó ninguna solución factible.")
+        return dict(self.mejor_parcial)
+
+    def _deshacer_fijacion(self, resultado, fijacion):
+        """
+        Traduce la solución del núcleo a los índices originales y agrega los
+        ítems fijados en 1. Si la solución incumbente usada para la fijación
+        es mejor, se devuelve esa (la fijación solo garantiza no perder
+        soluciones mejores que la incumbente).
+        """
+        items = fijacion["fijos_uno"] + [fijacion["libres"][k] for k in resultado["items"]]
+        valor = sum(self.values[i] for i in items)
+        if valor < fijacion["cota_inferior"]:
+            items = fijacion["incumbente"]
+            valor = sum(self.values[i] for i in items)
+            resultado["incumbente_fijacion"] = True
+
+        resultado["items"] = sorted(items)
+        resultado["total_value"] = valor
+        resultado["total_peso_usado"] = sum(self.weights[i] for i in items)
+        resultado["variables_fijadas"] = fijacion["variables_fijadas"]
+        return resultado
+
     def create_model(self):
         """
         Método placeholder para compatibilidad con FunSearch.
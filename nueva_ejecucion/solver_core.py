@@ -0,0 +1,154 @@
+# solver_core.py
+import time
+import numpy as np
+
+from dp_mochila import dp_capacidad
+from solver_mochila import SolverMochila
+
+
+# ============================================================
+# Solver exacto por "problema núcleo" (core) con núcleo expansible
+# al estilo expknap/minknap de Pisinger:
+#   1. Greedy por densidad y detección del ítem crítico s.
+#   2. Núcleo [a, b) alrededor de s: los ítems antes del núcleo
+#      quedan fijos en 1 y los posteriores en 0.
+#   3. El núcleo se resuelve exacto con DP sobre la capacidad residual.
+#   4. Con la cota de Dembo–Hammer se verifica que ningún ítem fuera
+#      del núcleo pueda cambiar de valor; si alguno puede, el núcleo
+#      crece por pasos hacia el lado dudoso (el paso se duplica en
+#      cada expansión) y se repite: cada núcleo mejor resuelto
+#      ajusta la incumbente y descarta dudosos.
+#   5. Si el siguiente núcleo supera max_celdas, se amplía de una vez
+#      hasta cubrir todos los dudosos y se resuelve con ramificación y
+#      acotamiento con límite de tiempo (en instancias fuertemente
+#      correlacionadas casi todos los ítems quedan dudosos y la DP
+#      sobre todos ellos sería n × C).
+# ============================================================
+
+# Celdas máximas (ítems × capacidad) de la DP de un núcleo
+MAX_CELDAS_CORE = 100_000_000
+
+
+def resolver_core(weights, values, capacity, delta_inicial=25, max_celdas=MAX_CELDAS_CORE,
+                  limite_tiempo_bb=10.0):
+    """
+    Resuelve la mochila 0/1 de forma exacta resolviendo solo el núcleo de
+    ítems cercanos al ítem crítico. Requiere pesos enteros.
+
+    Los núcleos de más de max_celdas celdas se resuelven con
+    ramificación y acotamiento limitado a limite_tiempo_bb segundos (None =
+    sin límite); si ese límite se alcanza la solución puede no ser óptima.
+
+    Devuelve un diccionario con el formato de KnapsackSkeleton.solve(), más
+    "tamano_core" (ítems del núcleo final), "expansiones" y "optimo".
+    """
+    start_time = time.time()
+    pesos = np.asarray(weights)
+    valores = np.asarray(values)
+    if pesos.size and not np.all(pesos == np.floor(pesos)):
+        raise ValueError("resolver_core requiere pesos enteros.")
+    capacidad = int(np.floor(capacity))
+    enteros = bool(np.all(valores == np.floor(valores)))
+
+    # Ítems de peso 0 y valor positivo entran siempre; los que no caben solos, nunca
+    libres = np.flatnonzero((pesos == 0) & (valores > 0))
+    candidatos = np.flatnonzero((pesos > 0) & (pesos <= capacidad) & (valores > 0))
+    densidad = valores[candidatos] / pesos[candidatos]
+    orden = candidatos[np.argsort(-densidad, kind="stable")]
+    w = pesos[orden].astype(np.int64)
+    p = valores[orden]
+    n = len(orden)
+
+    peso_pref = np.concatenate(([0], np.cumsum(w)))
+    valor_pref = np.concatenate(([0], np.cumsum(p)))
+
+    # Ítem crítico
+    s = int(np.searchsorted(peso_pref, capacidad, side="right")) - 1
+    if s >= n:
+        items = np.concatenate((libres, orden))
+        return _resultado(weights, values, items, start_time, 0, 0)
+
+    residual_s = capacidad - peso_pref[s]
+    r = p[s] / w[s]
+    cota_lp = valor_pref[s] + residual_s * r
+
+    # Incumbente inicial: greedy saltando los ítems que no caben
+    seleccion = np.zeros(n, dtype=bool)
+    seleccion[:s] = True
+    restante = residual_s
+    for k in range(s, n):
+        if w[k] <= restante:
+            seleccion[k] = True
+            restante -= w[k]
+    mejor_valor = p[seleccion].sum()
+
+    # Cota de Dembo–Hammer al invertir cada variable respecto a la solución LP
+    costo_reducido = np.abs(p - r * w)
+    cota_invertida = cota_lp - costo_reducido
+    if enteros:
+        cota_invertida = np.floor(cota_invertida + 1e-9)
+
+    def celdas(a, b):
+        return (b - a) * (int(min(capacidad - peso_pref[a], peso_pref[b] - peso_pref[a])) + 1)
+
+    a, b = max(0, s - delta_inicial), min(n, s + delta_inicial + 1)
+    paso_a = paso_b = delta_inicial
+    expansiones = 0
+    while True:
+        # Resolver el núcleo [a, b) con los ítems anteriores fijos en 1
+        residual = int(capacidad - peso_pref[a])
+        if celdas(a, b) <= max_celdas:
+            tope = int(min(residual, peso_pref[b] - peso_pref[a]))
+            sub = dp_capacidad(w[a:b], p[a:b], tope)
+            valor_sub, elegidos, optimo = sub["total_value"], sub["items"], True
+        else:
+            sub = SolverMochila(p[a:b].tolist(), [w[a:b].tolist()], [residual],
+                                limite_tiempo=limite_tiempo_bb).resolver()
+            valor_sub, elegidos, optimo = sub["valor_total"], sub["items"], sub["optimo"]
+        valor_core = valor_pref[a] + valor_sub
+        if valor_core > mejor_valor:
+            mejor_valor = valor_core
+            seleccion[:] = False
+            seleccion[:a] = True
+            seleccion[a + np.asarray(elegidos, dtype=np.int64)] = True
+
+        # ¿Algún ítem fuera del núcleo podría cambiar y mejorar la incumbente?
+        dudosos = np.flatnonzero(cota_invertida > mejor_valor)
+        izquierda, derecha = dudosos[dudosos < a], dudosos[dudosos >= b]
+        if izquierda.size == 0 and derecha.size == 0:
+            break
+
+        # Crecer un paso hacia cada lado dudoso; si el núcleo resultante es
+        # demasiado caro para la DP, cubrir de una vez todos los dudosos
+        nuevo_a, nuevo_b = a, b
+        if izquierda.size:
+            nuevo_a = max(int(izquierda.min()), a - paso_a)
+            paso_a *= 2
+        if derecha.size:
+            nuevo_b = min(int(derecha.max()) + 1, b + paso_b)
+            paso_b *= 2
+        if celdas(nuevo_a, nuevo_b) > max_celdas:
+            nuevo_a = min(a, int(izquierda.min())) if izquierda.size else a
+            nuevo_b = max(b, int(derecha.max()) + 1) if derecha.size else b
+        a, b = nuevo_a, nuevo_b
+        expansiones += 1
+
+    # Una incumbente que alcanza la cota de Dantzig es óptima aunque el B&B se haya cortado
+    if mejor_valor >= (np.floor(cota_lp + 1e-9) if enteros else cota_lp):
+        optimo = True
+
+    items = np.concatenate((libres, orden[seleccion]))
+    return _resultado(weights, values, items, start_time, b - a, expansiones, optimo)
+
+
+def _resultado(weights, values, items, start_time, tamano_core, expansiones, optimo=True):
+    items = sorted(int(i) for i in items)
+    return {
+        "items": items,
+        "total_value": sum(values[i] for i in items),
+        "total_peso_usado": sum(weights[i] for i in items),
+        "solve_time": time.time() - start_time,
+        "tamano_core": tamano_core,
+        "expansiones": expansiones,
+        "optimo": optimo
+    }
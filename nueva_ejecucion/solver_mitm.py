@@ -0,0 +1,81 @@
+# solver_mitm.py
+import time
+import numpy as np
+
+
+# ============================================================
+# Solver exacto "meet-in-the-middle" (Horowitz–Sahni)
+# Los ítems se dividen en dos mitades; cada mitad se enumera de
+# forma vectorizada (duplicando los arreglos de peso/valor por
+# ítem) y se reduce a sus estados no dominados, ordenados por peso
+# con valor creciente (el máximo prefijo queda implícito). Para
+# cada subconjunto de la primera mitad se busca con searchsorted
+# el mejor complemento de la segunda. Independiente de la
+# capacidad: pensado para n <= MAX_ITEMS_MITM con pesos enormes.
+# ============================================================
+
+MAX_ITEMS_MITM = 62
+
+# Con más estados que esto se eliminan dominados durante la enumeración
+UMBRAL_PODA = 1 << 16
+
+
+def _podar_dominados(pesos, valores, mascaras):
+    """Ordena por peso y conserva solo los estados con valor estrictamente creciente."""
+    o = np.lexsort((-valores, pesos))
+    pesos, valores, mascaras = pesos[o], valores[o], mascaras[o]
+    maximo_previo = np.concatenate(([-np.inf], np.maximum.accumulate(valores)[:-1]))
+    vivos = valores > maximo_previo
+    return pesos[vivos], valores[vivos], mascaras[vivos]
+
+
+def _enumerar_mitad(w, p, capacity):
+    """Todos los subconjuntos factibles de una mitad (sin dominados)."""
+    pesos = np.zeros(1)
+    valores = np.zeros(1)
+    mascaras = np.zeros(1, dtype=np.int64)
+    for j in range(len(w)):
+        cabe = pesos + w[j] <= capacity
+        pesos = np.concatenate((pesos, pesos[cabe] + w[j]))
+        valores = np.concatenate((valores, valores[cabe] + p[j]))
+        mascaras = np.concatenate((mascaras, mascaras[cabe] | np.int64(1 << j)))
+        if len(pesos) > UMBRAL_PODA:
+            pesos, valores, mascaras = _podar_dominados(pesos, valores, mascaras)
+    return _podar_dominados(pesos, valores, mascaras)
+
+
+def resolver_mitm(weights, values, capacity):
+    """
+    Resuelve la mochila 0/1 de forma exacta por meet-in-the-middle.
+    Devuelve un diccionario con el formato de KnapsackSkeleton.solve().
+    """
+    start_time = time.time()
+    pesos = np.asarray(weights, dtype=float)
+    valores = np.asarray(values, dtype=float)
+
+    libres = np.flatnonzero((pesos == 0) & (valores > 0))
+    candidatos = np.flatnonzero((pesos > 0) & (pesos <= capacity) & (valores > 0))
+    if len(candidatos) > MAX_ITEMS_MITM:
+        raise ValueError(f"resolver_mitm admite a lo más {MAX_ITEMS_MITM} ítems útiles.")
+
+    mitad = len(candidatos) // 2
+    izq, der = candidatos[:mitad], candidatos[mitad:]
+    w_a, p_a, m_a = _enumerar_mitad(pesos[izq], valores[izq], capacity)
+    w_b, p_b, m_b = _enumerar_mitad(pesos[der], valores[der], capacity)
+
+    # Mejor complemento de la segunda mitad para cada estado de la primera
+    j = np.searchsorted(w_b, capacity - w_a, side="right") - 1
+    total = p_a + p_b[j]
+    i = int(np.argmax(total))
+    mascara_a, mascara_b = int(m_a[i]), int(m_b[j[i]])
+
+    items = list(libres)
+    items += [izq[k] for k in range(len(izq)) if (mascara_a >> k) & 1]
+    items += [der[k] for k in range(len(der)) if (mascara_b >> k) & 1]
+    items = sorted(int(i) for i in items)
+    return {
+        "items": items,
+        "total_value": sum(values[i] for i in items),
+        "total_peso_usado": sum(weights[i] for i in items),
+        "solve_time": time.time() - start_time
+    }
@@ -0,0 +1,126 @@
+# solver_mochila.py
+import time
+from bisect import bisect_right
+
+
+class SolverMochila:
+    """
+    Solver exacto nativo para la mochila 0/1 por ramificación y acotamiento
+    (branch-and-bound en profundidad, esquema Horowitz–Sahni).
+
+    Expone la misma interfaz que el solver de OR-Tools usado en
+    analisisMochila.EvaluadorMochila:
+        solver = SolverMochila(values, weights=[pesos], capacities=[capacidad])
+        solver.resolver()
+        solver.obtener_resultado()
+
+    - Los ítems se recorren por densidad decreciente y en cada nodo se explora
+      primero la rama que sugiere la relajación lineal (incluir el ítem).
+    - Cada nodo se poda con la cota de Dantzig calculada con sumas prefijas
+      y búsqueda binaria (O(log n) por nodo).
+    - Con limite_nodos o limite_tiempo la búsqueda se detiene y devuelve la
+      mejor solución encontrada (incumbente); 'optimo' indica si se probó.
+    """
+
+    def __init__(self, values, weights, capacities, limite_nodos=None, limite_tiempo=None):
+        if len(weights) != 1 or len(capacities) != 1:
+            raise ValueError("SolverMochila solo admite una dimensión de peso (mochila 0/1 clásica).")
+        self.values = list(values)
+        self.weights = list(weights[0])
+        self.capacity = capacities[0]
+        if len(self.values) != len(self.weights):
+            raise ValueError("values y weights deben tener el mismo largo.")
+        self.limite_nodos = limite_nodos
+        self.limite_tiempo = limite_tiempo
+        self.resultado = None
+
+    def resolver(self):
+        start_time = time.time()
+        capacity = self.capacity
+        enteros = all(float(v).is_integer() for v in self.values)
+
+        # Ítems candidatos ordenados por densidad (los que no caben solos se descartan)
+        candidatos = [i for i, w in enumerate(self.weights) if w <= capacity]
+        candidatos.sort(key=lambda i: self.values[i] / self.weights[i] if self.weights[i] > 0
+                        else (float("inf") if self.values[i] > 0 else 0.0), reverse=True)
+        w = [self.weights[i] for i in candidatos]
+        p = [self.values[i] for i in candidatos]
+        n = len(candidatos)
+
+        peso_pref = [0] * (n + 1)
+        valor_pref = [0] * (n + 1)
+        for k in range(n):
+            peso_pref[k + 1] = peso_pref[k] + w[k]
+            valor_pref[k + 1] = valor_pref[k] + p[k]
+
+        def cota(j, residual):
+            # Relajación lineal de los ítems j..n-1 con capacidad residual
+            r = bisect_right(peso_pref, peso_pref[j] + residual, j) - 1
+            valor = valor_pref[r] - valor_pref[j]
+            if r < n:
+                valor += (residual - (peso_pref[r] - peso_pref[j])) * p[r] / w[r]
+            return int(valor + 1e-9) if enteros else valor
+
+        # Incumbente inicial: greedy por densidad (saltando los que no caben)
+        mejor_valor, peso_usado, mejor = 0, 0, []
+        for k in range(n):
+            if peso_usado + w[k] <= capacity:
+                peso_usado += w[k]
+                mejor_valor += p[k]
+                mejor.append(k)
+
+        cota_raiz = cota(0, capacity)
+        nodos = 0
+        optimo = True
+        tomados = []
+        residual = capacity
+        valor_actual = 0
+        j = 0
+
+        while mejor_valor < cota_raiz:
+            if j < n:
+                nodos += 1
+                if (self.limite_nodos is not None and nodos > self.limite_nodos) or (
+                        self.limite_tiempo is not None and nodos % 1024 == 0
+                        and time.time() - start_time > self.limite_tiempo):
+                    optimo = False
+                    break
+
+                if valor_actual + cota(j, residual) > mejor_valor:
+                    # Avance: incluir consecutivamente los ítems que caben
+                    r = bisect_right(peso_pref, peso_pref[j] + residual, j) - 1
+                    tomados.extend(range(j, r))
+                    residual -= peso_pref[r] - peso_pref[j]
+                    valor_actual += valor_pref[r] - valor_pref[j]
+                    # El ítem r (si existe) no cabe: se fija en 0
+                    j = r + 1
+                    continue
+            elif valor_actual > mejor_valor:
+                mejor_valor = valor_actual
+                mejor = list(tomados)
+
+            # Retroceso: el último ítem incluido pasa a 0
+            if not tomados:
+                break
+            i = tomados.pop()
+            residual += w[i]
+            valor_actual -= p[i]
+            j = i + 1
+
+        items = sorted(candidatos[k] for k in mejor)
+        self.resultado = {
+            "items": items,
+            "valor_total": sum(self.values[i] for i in items),
+            "peso_total": sum(self.weights[i] for i in items),
+            "num_items_seleccionados": len(items),
+            "tiempo_segundos": time.time() - start_time,
+            "nodos": nodos,
+            "optimo": optimo,
+            "cota_superior": cota_raiz,
+        }
+        return self.resultado
+
+    def obtener_resultado(self):
+        if self.resultado is None:
+            raise ValueError("Primero debes ejecutar resolver().")
+        return self.resultado
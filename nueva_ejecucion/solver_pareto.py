@@ -0,0 +1,111 @@
+# solver_pareto.py
+import time
+import numpy as np
+
+
+# ============================================================
+# Solver exacto por frontera de Pareto (Nemhauser–Ullmann)
+# En lugar de un arreglo denso sobre todas las capacidades se
+# mantiene la lista de estados (peso, valor) no dominados,
+# ordenada por peso. Agregar un ítem es fusionar la lista con su
+# copia desplazada y eliminar los dominados (todo con NumPy).
+# Los estados cuya cota de Dantzig no supera la incumbente se
+# descartan. No requiere pesos ni valores enteros.
+# ============================================================
+
+def resolver_pareto(weights, values, capacity):
+    """
+    Resuelve la mochila 0/1 de forma exacta manteniendo solo estados no
+    dominados. Conviene cuando la capacidad es enorme pero la frontera de
+    Pareto es pequeña.
+    Devuelve un diccionario con el formato de KnapsackSkeleton.solve() más
+    "estados_max" (tamaño máximo de la frontera).
+    """
+    start_time = time.time()
+    pesos = np.asarray(weights, dtype=float)
+    valores = np.asarray(values, dtype=float)
+    enteros = bool(np.all(valores == np.floor(valores)))
+
+    libres = np.flatnonzero((pesos == 0) & (valores > 0))
+    candidatos = np.flatnonzero((pesos > 0) & (pesos <= capacity) & (valores > 0))
+    orden = candidatos[np.argsort(-(valores[candidatos] / pesos[candidatos]), kind="stable")]
+    w = pesos[orden]
+    p = valores[orden]
+    n = len(orden)
+    peso_pref = np.concatenate(([0.0], np.cumsum(w)))
+    valor_pref = np.concatenate(([0.0], np.cumsum(p)))
+
+    def cota(k, residual):
+        # Relajación lineal de los ítems k..n-1 para cada capacidad residual
+        r = np.searchsorted(peso_pref, peso_pref[k] + residual, side="right") - 1
+        valor = valor_pref[r] - valor_pref[k]
+        r_frac = np.minimum(r, n - 1)
+        frac = np.where(r < n, (residual - (peso_pref[r] - peso_pref[k])) * p[r_frac] / w[r_frac], 0.0)
+        total = valor + frac
+        return np.floor(total + 1e-9) if enteros else total
+
+    # Incumbente inicial: greedy por densidad
+    greedy, usado = [], 0.0
+    for k in range(n):
+        if usado + w[k] <= capacity:
+            usado += w[k]
+            greedy.append(k)
+    mejor_valor = float(p[greedy].sum()) if greedy else 0.0
+    mejor_estado = None  # (etapa, posición) del estado incumbente, None = greedy
+
+    estados_w = np.zeros(1)
+    estados_p = np.zeros(1)
+    padres, tomados = [], []
+    estados_max = 1
+
+    for k in range(n):
+        if len(estados_w) == 0:
+            break  # ningún estado puede superar la incumbente
+        cabe = estados_w + w[k] <= capacity
+        nuevos = np.flatnonzero(cabe)
+        todos_w = np.concatenate((estados_w, estados_w[nuevos] + w[k]))
+        todos_p = np.concatenate((estados_p, estados_p[nuevos] + p[k]))
+        padre = np.concatenate((np.arange(len(estados_w)), nuevos))
+        tomado = np.concatenate((np.zeros(len(estados_w), dtype=bool), np.ones(len(nuevos), dtype=bool)))
+
+        # Orden por peso ascendente (valor descendente en empates) y poda de dominados
+        o = np.lexsort((-todos_p, todos_w))
+        todos_w, todos_p, padre, tomado = todos_w[o], todos_p[o], padre[o], tomado[o]
+        maximo_previo = np.concatenate(([-np.inf], np.maximum.accumulate(todos_p)[:-1]))
+        vivos = todos_p > maximo_previo
+
+        # Actualizar incumbente y podar por cota
+        i_max = int(np.argmax(np.where(vivos, todos_p, -np.inf)))
+        nueva_incumbente = todos_p[i_max] > mejor_valor
+        if nueva_incumbente:
+            mejor_valor = float(todos_p[i_max])
+        vivos &= (todos_p + cota(k + 1, capacity - todos_w)) > mejor_valor
+        if nueva_incumbente:
+            # El estado incumbente se conserva en esta etapa para poder reconstruirlo
+            vivos[i_max] = True
+            mejor_estado = (k + 1, int(np.count_nonzero(vivos[:i_max])))
+
+        estados_w, estados_p = todos_w[vivos], todos_p[vivos]
+        padres.append(padre[vivos])
+        tomados.append(tomado[vivos])
+        estados_max = max(estados_max, len(estados_w))
+
+    # Reconstrucción siguiendo los punteros a la etapa anterior
+    if mejor_estado is None:
+        elegidos = greedy
+    else:
+        etapa, pos = mejor_estado
+        elegidos = []
+        for k in range(etapa - 1, -1, -1):
+            if tomados[k][pos]:
+                elegidos.append(k)
+            pos = padres[k][pos]
+
+    items = sorted(int(i) for i in list(libres) + [orden[k] for k in elegidos])
+    return {
+        "items": items,
+        "total_value": sum(values[i] for i in items),
+        "total_peso_usado": sum(weights[i] for i in items),
+        "solve_time": time.time() - start_time,
+        "estados_max": estados_max
+    }
@@ -0,0 +1,116 @@
+# suma_subconjuntos.py
+import time
+from collections import defaultdict
+
+import numpy as np
+import pandas as pd
+
+
+# ============================================================
+# Motor bitset de pesos alcanzables (subset-sum)
+# El bit c de un entero de Python indica si existe un subconjunto
+# de ítems con peso exactamente c. Agregar un ítem de peso w es
+# un desplazamiento: alcanzables |= alcanzables << w.
+# Los pesos repetidos se agrupan con descomposición binaria de
+# multiplicidades (1, 2, 4, ...), así 3000 ítems con pesos 1..50
+# requieren solo unos cientos de desplazamientos.
+# ============================================================
+
+def _piezas(weights, capacity):
+    """
+    Agrupa los ítems por peso y divide cada grupo en piezas de tamaño
+    1, 2, 4, ..., resto. Devuelve una lista de (peso_pieza, [índices]).
+    """
+    grupos = defaultdict(list)
+    for i, w in enumerate(weights):
+        if 0 < w <= capacity:
+            grupos[int(w)].append(i)
+
+    piezas = []
+    for w, indices in grupos.items():
+        k, inicio = 1, 0
+        while inicio < len(indices):
+            k = min(k, len(indices) - inicio)
+            piezas.append((w * k, indices[inicio:inicio + k]))
+            inicio += k
+            k *= 2
+    return piezas
+
+
+def _validar(weights, capacity):
+    if any(float(w) != int(w) for w in weights):
+        raise ValueError("El motor bitset requiere pesos enteros.")
+    return int(np.floor(capacity))
+
+
+def peso_maximo_alcanzable(weights, capacity):
+    """Máximo peso total <= capacidad que se puede formar con los ítems."""
+    capacidad = _validar(weights, capacity)
+    mascara = (1 << (capacidad + 1)) - 1
+    objetivo = 1 << capacidad
+    alcanzables = 1
+    for w, _ in _piezas(weights, capacidad):
+        alcanzables |= (alcanzables << w) & mascara
+        if alcanzables & objetivo:
+            return capacidad
+    return alcanzables.bit_length() - 1
+
+
+def resolver_suma_subconjuntos(weights, capacity):
+    """
+    Resuelve de forma exacta el problema subset-sum (instancias con
+    valor == peso): encuentra el subconjunto de peso máximo <= capacidad.
+    Guarda el bitset tras cada pieza para reconstruir la solución.
+    Devuelve un diccionario con el formato de KnapsackSkeleton.solve().
+    """
+    start_time = time.time()
+    capacidad = _validar(weights, capacity)
+    mascara = (1 << (capacidad + 1)) - 1
+    piezas = _piezas(weights, capacidad)
+
+    historial = [1]
+    for w, _ in piezas:
+        historial.append(historial[-1] | ((historial[-1] << w) & mascara))
+
+    objetivo = historial[-1].bit_length() - 1
+    items = [i for i, w in enumerate(weights) if w == 0]
+    c = objetivo
+    for k in range(len(piezas) - 1, -1, -1):
+        if not (historial[k] >> c) & 1:
+            w, indices = piezas[k]
+            items.extend(indices)
+            c -= w
+
+    items.sort()
+    return {
+        "items": items,
+        "total_value": sum(weights[i] for i in items),
+        "total_peso_usado": sum(weights[i] for i in items),
+        "solve_time": time.time() - start_time
+    }
+
+
+def techo_llenado(weights, capacity):
+    """
+    peso_maximo_alcanzable como columna de diagnóstico: NaN si los pesos no
+    son enteros (el motor bitset no aplica) en lugar de un error.
+    """
+    try:
+        return peso_maximo_alcanzable(weights, capacity)
+    except ValueError:
+        return float("nan")
+
+
+def agregar_techo_llenado(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Agrega al DataFrame de instancias la columna 'peso_max_alcanzable':
+    el mejor llenado posible de la mochila, techo real de la métrica
+    'eficiencia' de evaluate_candidate (NaN en instancias con pesos no
+    enteros).
+    Modifica el DataFrame recibido y lo devuelve.
+    """
+    df["peso_max_alcanzable"] = [
+        techo_llenado(pesos, capacidad)
+        for pesos, capacidad in zip(df["pesos"], df["capacidad"])
+    ]
+    return df